@@ -4,14 +4,176 @@ Stores frequently accessed movie data in SQLite to reduce API calls
 and improve performance.
 """
 
+import atexit
 import sqlite3
-import json
-from typing import Optional, List
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
+import orjson
 from src.matcher import MatchedMovie
 
 
+# Per-connection settings; synchronous=NORMAL is safe under WAL and avoids an
+# fsync on every commit. busy_timeout absorbs writer/checkpoint lock stalls.
+# analysis_limit samples each index rather than scanning it during ANALYZE.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA analysis_limit=1000",
+)
+
+# Large enough to hold every distinct statement issued by the cache
+STATEMENT_CACHE_SIZE = 256
+
+# Bound parameters per IN (...) list, below SQLite's historical 999 limit
+SQL_VARIABLE_CHUNK = 900
+
+# Rows written or deleted in one call before planner stats are refreshed
+ANALYZE_BATCH_SIZE = 100
+
+# Buffered get() hits before last_accessed times are written back
+ACCESS_FLUSH_SIZE = 1000
+
+# Rows fetched per query when streaming a platform catalog
+CATALOG_FETCH_SIZE = 1000
+
+# Hours a synced platform catalog is served from SQL before falling back
+# to live matching; matches the sync's 48h expiration
+CATALOG_MAX_AGE_HOURS = 48
+
+# Prepared statements, kept as module constants so every call reuses the
+# same string and hits sqlite3's per-connection statement cache
+_SQL_GET_BY_IMDB = "SELECT * FROM movies WHERE imdb_id = ? AND cached_at >= ?"
+# Substring match served by the trigram index in movies_fts
+_SQL_GET_BY_TITLE = """
+    SELECT movies.* FROM movies_fts
+    JOIN movies ON movies.rowid = movies_fts.rowid
+    WHERE movies_fts.title LIKE ?
+    ORDER BY movies.cached_at DESC LIMIT 1
+"""
+# MAX() so a buffered read time never rewinds a newer write's timestamp
+_SQL_TOUCH = "UPDATE movies SET last_accessed = MAX(last_accessed, ?) WHERE imdb_id = ?"
+# Upsert in place (keeping rowid, so platform rows stay attached) rather
+# than INSERT OR REPLACE's delete + reinsert. A movie re-cached under a new
+# title but the same IMDb ID takes over its existing row.
+_SQL_UPSERT = """
+    INSERT INTO movies (
+        imdb_id, title, year, justwatch_id, streaming_platforms,
+        justwatch_rating, letterboxd_slug, letterboxd_rating,
+        genres, letterboxd_url, cached_at, last_accessed
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(title, COALESCE(year, -1)) DO UPDATE SET
+        imdb_id = excluded.imdb_id,
+        justwatch_id = excluded.justwatch_id,
+        streaming_platforms = excluded.streaming_platforms,
+        justwatch_rating = excluded.justwatch_rating,
+        letterboxd_slug = excluded.letterboxd_slug,
+        letterboxd_rating = excluded.letterboxd_rating,
+        genres = excluded.genres,
+        letterboxd_url = excluded.letterboxd_url,
+        cached_at = excluded.cached_at,
+        last_accessed = excluded.last_accessed
+    ON CONFLICT(imdb_id) WHERE imdb_id IS NOT NULL DO UPDATE SET
+        title = excluded.title,
+        year = excluded.year,
+        justwatch_id = excluded.justwatch_id,
+        streaming_platforms = excluded.streaming_platforms,
+        justwatch_rating = excluded.justwatch_rating,
+        letterboxd_slug = excluded.letterboxd_slug,
+        letterboxd_rating = excluded.letterboxd_rating,
+        genres = excluded.genres,
+        letterboxd_url = excluded.letterboxd_url,
+        cached_at = excluded.cached_at,
+        last_accessed = excluded.last_accessed
+"""
+# Run before each upsert: when the incoming (title, year) and IMDb ID match
+# two different rows, ON CONFLICT(title, year) would set an IMDb ID another
+# row holds, so drop that other row first (as INSERT OR REPLACE did)
+_SQL_DELETE_IMDB_CONFLICT = """
+    DELETE FROM movies
+    WHERE imdb_id = ? AND rowid != (SELECT rowid FROM movies WHERE title = ? AND year IS ?)
+"""
+_SQL_CLEAR_PLATFORMS = """
+    DELETE FROM movie_platforms
+    WHERE movie_id IN (SELECT rowid FROM movies WHERE title = ? AND year IS ?)
+"""
+_SQL_INSERT_PLATFORM = """
+    INSERT OR IGNORE INTO movie_platforms (movie_id, platform)
+    SELECT rowid, ? FROM movies WHERE title = ? AND year IS ?
+"""
+_SQL_DELETE_EXPIRED = "DELETE FROM movies WHERE cached_at < ?"
+_SQL_DELETE_ALL = "DELETE FROM movies"
+_SQL_COUNT = "SELECT COUNT(*) as count FROM movies"
+_SQL_AGE_RANGE = "SELECT MIN(cached_at) as oldest, MAX(cached_at) as newest FROM movies"
+# Keyset-paginated on movie_id so each page is an independent query
+_SQL_PLATFORM_CATALOG = """
+    SELECT movie_platforms.movie_id, movies.* FROM movie_platforms
+    JOIN movies ON movies.rowid = movie_platforms.movie_id
+    WHERE movie_platforms.platform = ? AND movie_platforms.movie_id > ?
+    ORDER BY movie_platforms.movie_id
+    LIMIT ?
+"""
+_SQL_HAS_PLATFORM = "SELECT 1 FROM catalog_syncs WHERE platform = ? AND synced_at >= ?"
+_SQL_MARK_SYNCED = """
+    INSERT INTO catalog_syncs (platform, synced_at) VALUES (?, ?)
+    ON CONFLICT(platform) DO UPDATE SET synced_at = excluded.synced_at
+"""
+# A sync rescrapes the whole catalog, so every row still on the platform
+# has just been confirmed, even those it didn't need to re-match
+_SQL_REFRESH_PLATFORM = """
+    UPDATE movies SET cached_at = ?
+    WHERE rowid IN (SELECT movie_id FROM movie_platforms WHERE platform = ?)
+"""
+_SQL_DELETE_SYNCS = "DELETE FROM catalog_syncs"
+# Base of query_platform; optional filters are appended before the ORDER BY.
+# The platform matches case-insensitively as a substring of the package
+# name, like JustWatchClient.search_by_platform. DESC puts NULL ratings
+# last, and rowid keeps ties in insertion order.
+_SQL_QUERY_PLATFORM = """
+    SELECT movies.* FROM movies
+    WHERE movies.cached_at >= ? AND EXISTS (
+        SELECT 1 FROM movie_platforms
+        WHERE movie_platforms.movie_id = movies.rowid
+        AND instr(lower(movie_platforms.platform), lower(?)) > 0
+    )
+"""
+_SQL_QUERY_PLATFORM_ORDER = " ORDER BY movies.letterboxd_rating DESC, movies.rowid LIMIT ?"
+_SQL_PLATFORM_TITLES = """
+    SELECT movies.title, movies.year, movies.imdb_id FROM movies
+    JOIN movie_platforms ON movie_platforms.movie_id = movies.rowid
+    WHERE movie_platforms.platform = ?
+"""
+
+
+def _encode_list(values: Optional[List[str]]) -> Optional[str]:
+    """Serialize a list column to JSON text (None for empty)"""
+    return orjson.dumps(values).decode() if values else None
+
+
+@lru_cache(maxsize=1024)
+def _decode_list(text: str) -> tuple:
+    """Parse a JSON list column
+    
+    Platform and genre lists repeat heavily across rows (e.g. '["Netflix"]'),
+    so parsed values are memoized. A tuple is cached so callers can't mutate
+    the shared entry.
+    """
+    return tuple(orjson.loads(text))
+
+
+# (normalized title, year) pair used to diff scraped and cached catalogs
+TitleKey = Tuple[str, Optional[int]]
+
+
+def title_key(title: str, year: Optional[int] = None) -> TitleKey:
+    """Build the (title, year) key used to diff scraped and cached catalogs"""
+    return ((title or '').strip().lower(), year or None)
+
+
 class MovieCache:
     """SQLite-based cache for movie data"""
     
@@ -20,20 +182,62 @@ class MovieCache:
         Initialize movie cache
         
         Args:
-            cache_file: Path to SQLite database file
+            cache_file: Path to SQLite database file (":memory:" for a
+                private in-memory database, e.g. in tests)
         """
         self.cache_file = cache_file
         self._ensure_cache_dir()
+        self._lock = threading.Lock()
+        self._access_buffer: dict[str, str] = {}
+        self._conn = self._connect()
         self._init_db()
+        atexit.register(self.close)
     
     def _ensure_cache_dir(self):
         """Create cache directory if it doesn't exist"""
         cache_dir = Path(self.cache_file).parent
         cache_dir.mkdir(parents=True, exist_ok=True)
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared connection with the cache's PRAGMAs applied
+        
+        A single connection is reused for the lifetime of the cache and
+        serialized with self._lock, so it may be shared across threads.
+        """
+        conn = sqlite3.connect(
+            self.cache_file,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def close(self):
+        """Flush buffered access times and close the shared database connection"""
+        # Drop the exit hook so closed caches (e.g. per-test ones) can be freed
+        atexit.unregister(self.close)
+        with self._lock:
+            if self._access_buffer:
+                self._flush_access()
+            self._conn.close()
+    
+    def _flush_access(self):
+        """Write buffered last_accessed times in one transaction (lock held)"""
+        with self._conn as conn:
+            conn.executemany(
+                _SQL_TOUCH,
+                [(accessed, imdb_id) for imdb_id, accessed in self._access_buffer.items()]
+            )
+        self._access_buffer.clear()
+    
     def _init_db(self):
         """Initialize database schema"""
-        with sqlite3.connect(self.cache_file) as conn:
+        with self._lock, self._conn as conn:
+            # WAL is persistent in the database file, so this only needs to
+            # run once; it lets readers proceed while a sync is writing
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS movies (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,13 +259,130 @@ class MovieCache:
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_title ON movies(title)
             """)
+            # The key upserts conflict on. UNIQUE(title, year) treats NULL
+            # years as distinct, so undated titles would gain a row on every
+            # write; COALESCE makes them collide too. Caches from before the
+            # index (including the older imdb_id-keyed schema) may hold
+            # duplicates, so keep only the newest of each.
+            has_title_key = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_title_key'"
+            ).fetchone()
+            if not has_title_key:
+                conn.execute("""
+                    DELETE FROM movies WHERE rowid NOT IN (
+                        SELECT MAX(rowid) FROM movies GROUP BY title, COALESCE(year, -1)
+                    )
+                """)
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_imdb_id ON movies(imdb_id)
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_title_key
+                ON movies(title, COALESCE(year, -1))
+            """)
+            # One row per IMDb ID; partial so the many unmatched rows without
+            # an ID don't collide. Older caches may hold duplicates from
+            # before the constraint, so keep only the newest of each.
+            has_imdb_unique = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_imdb_unique'"
+            ).fetchone()
+            if not has_imdb_unique:
+                conn.execute("""
+                    DELETE FROM movies
+                    WHERE imdb_id IS NOT NULL AND rowid NOT IN (
+                        SELECT MAX(rowid) FROM movies
+                        WHERE imdb_id IS NOT NULL GROUP BY imdb_id
+                    )
+                """)
+                conn.execute("DROP INDEX IF EXISTS idx_imdb_id")
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_imdb_unique
+                ON movies(imdb_id) WHERE imdb_id IS NOT NULL
             """)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_cached_at ON movies(cached_at)
             """)
-            conn.commit()
+            # Lets query_platform walk movies best-rated first and stop at
+            # its LIMIT instead of sorting the whole catalog
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rating ON movies(letterboxd_rating)
+            """)
+            
+            # Normalized platform membership so catalog lookups use an index
+            # instead of scanning the streaming_platforms JSON text. Keyed on
+            # rowid so caches created with the older imdb_id-keyed schema work.
+            has_platforms = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movie_platforms'"
+            ).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS movie_platforms (
+                    movie_id INTEGER NOT NULL,
+                    platform TEXT NOT NULL,
+                    PRIMARY KEY(movie_id, platform)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_platform ON movie_platforms(platform)
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_movies_delete_platforms
+                AFTER DELETE ON movies
+                BEGIN
+                    DELETE FROM movie_platforms WHERE movie_id = old.rowid;
+                END
+            """)
+            
+            # Trigram full-text index over titles so get_by_title's
+            # '%title%' substring search doesn't scan the whole table
+            has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'"
+            ).fetchone()
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts
+                USING fts5(title, content='movies', tokenize='trigram')
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_movies_fts_insert
+                AFTER INSERT ON movies
+                BEGIN
+                    INSERT INTO movies_fts(rowid, title) VALUES (new.rowid, new.title);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_movies_fts_delete
+                AFTER DELETE ON movies
+                BEGIN
+                    INSERT INTO movies_fts(movies_fts, rowid, title)
+                    VALUES ('delete', old.rowid, old.title);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_movies_fts_update
+                AFTER UPDATE OF title ON movies
+                BEGIN
+                    INSERT INTO movies_fts(movies_fts, rowid, title)
+                    VALUES ('delete', old.rowid, old.title);
+                    INSERT INTO movies_fts(rowid, title) VALUES (new.rowid, new.title);
+                END
+            """)
+            if not has_fts:
+                conn.execute("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')")
+            
+            # Platforms whose full catalog a sync has written. Search results
+            # also fill movie_platforms, so only these are complete enough
+            # for query_platform to stand in for live matching.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_syncs (
+                    platform TEXT PRIMARY KEY COLLATE NOCASE,
+                    synced_at TEXT NOT NULL
+                )
+            """)
+            
+            if not has_platforms:
+                # Backfill caches created before the table existed
+                conn.execute("""
+                    INSERT OR IGNORE INTO movie_platforms (movie_id, platform)
+                    SELECT movies.rowid, json_each.value
+                    FROM movies, json_each(movies.streaming_platforms)
+                    WHERE movies.streaming_platforms IS NOT NULL
+                """)
     
     def get(self, imdb_id: str, max_age_hours: int = 24) -> Optional[MatchedMovie]:
         """
@@ -74,32 +395,63 @@ class MovieCache:
         Returns:
             MatchedMovie object or None if not found or expired
         """
-        with sqlite3.connect(self.cache_file) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT * FROM movies WHERE imdb_id = ?",
-                (imdb_id,)
-            )
-            row = cursor.fetchone()
+        now = datetime.now()
+        cutoff = (now - timedelta(hours=max_age_hours)).isoformat()
+        
+        with self._lock:
+            # Expired entries are filtered by SQLite via the cached_at bound
+            row = self._conn.execute(_SQL_GET_BY_IMDB, (imdb_id, cutoff)).fetchone()
             
             if not row:
                 return None
             
-            # Check if cache entry is expired
-            cached_at = datetime.fromisoformat(row['cached_at'])
-            if datetime.now() - cached_at > timedelta(hours=max_age_hours):
-                return None
-            
-            # Update last accessed time
-            conn.execute(
-                "UPDATE movies SET last_accessed = ? WHERE imdb_id = ?",
-                (datetime.now().isoformat(), imdb_id)
-            )
-            conn.commit()
+            # Record the access in memory so a hit stays a pure read;
+            # times are written back in batches
+            self._access_buffer[imdb_id] = now.isoformat()
+            if len(self._access_buffer) >= ACCESS_FLUSH_SIZE:
+                self._flush_access()
             
             # Convert row to MatchedMovie
             return self._row_to_movie(row)
     
+    def get_many(self, imdb_ids: Iterable[str], max_age_hours: int = 24) -> Dict[str, MatchedMovie]:
+        """
+        Get several movies from cache in chunked IN (...) queries
+        
+        Args:
+            imdb_ids: IMDb IDs to look up
+            max_age_hours: Maximum age of cached data in hours
+            
+        Returns:
+            Dict of IMDb ID -> MatchedMovie for the IDs found and not expired
+        """
+        ids = list(dict.fromkeys(i for i in imdb_ids if i))
+        if not ids:
+            return {}
+        
+        now = datetime.now()
+        cutoff = (now - timedelta(hours=max_age_hours)).isoformat()
+        accessed = now.isoformat()
+        
+        movies = {}
+        with self._lock:
+            for i in range(0, len(ids), SQL_VARIABLE_CHUNK):
+                chunk = ids[i:i + SQL_VARIABLE_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT * FROM movies WHERE imdb_id IN ({placeholders}) AND cached_at >= ?",
+                    (*chunk, cutoff)
+                ).fetchall()
+                for row in rows:
+                    movies[row['imdb_id']] = self._row_to_movie(row)
+            
+            # Buffered like get() hits
+            self._access_buffer.update(dict.fromkeys(movies, accessed))
+            if len(self._access_buffer) >= ACCESS_FLUSH_SIZE:
+                self._flush_access()
+        
+        return movies
+    
     def get_by_title(self, title: str, max_age_hours: int = 24) -> Optional[MatchedMovie]:
         """
         Get movie from cache by title
@@ -111,20 +463,18 @@ class MovieCache:
         Returns:
             MatchedMovie object or None if not found or expired
         """
-        with sqlite3.connect(self.cache_file) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT * FROM movies WHERE title LIKE ? ORDER BY cached_at DESC LIMIT 1",
-                (f"%{title}%",)
-            )
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_GET_BY_TITLE, (f"%{title}%",))
             row = cursor.fetchone()
             
             if not row:
                 return None
             
-            # Check if cache entry is expired
-            cached_at = datetime.fromisoformat(row['cached_at'])
-            if datetime.now() - cached_at > timedelta(hours=max_age_hours):
+            # Check if cache entry is expired; ISO-8601 timestamps order
+            # lexicographically, so no datetime parsing is needed
+            if row['cached_at'] < cutoff:
                 return None
             
             return self._row_to_movie(row)
@@ -136,40 +486,59 @@ class MovieCache:
         Args:
             movie: MatchedMovie object to cache
         """
-        now = datetime.now().isoformat()
-        
-        with sqlite3.connect(self.cache_file) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO movies (
-                    imdb_id, title, year, justwatch_id, streaming_platforms,
-                    justwatch_rating, letterboxd_slug, letterboxd_rating,
-                    genres, letterboxd_url, cached_at, last_accessed
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                movie.imdb_id,
-                movie.title,
-                movie.year,
-                movie.justwatch_id,
-                json.dumps(movie.streaming_platforms) if movie.streaming_platforms else None,
-                movie.justwatch_rating,
-                movie.letterboxd_slug,
-                movie.letterboxd_rating,
-                json.dumps(movie.genres) if movie.genres else None,
-                movie.letterboxd_url,
-                now,
-                now
-            ))
-            conn.commit()
+        self.set_many([movie])
     
     def set_many(self, movies: List[MatchedMovie]):
         """
         Store multiple movies in cache
         
+        All rows are written in one transaction, so a batch costs one
+        commit regardless of its size.
+        
         Args:
             movies: List of MatchedMovie objects to cache
         """
-        for movie in movies:
-            self.set(movie)
+        now = datetime.now().isoformat()
+        rows = [self._movie_to_row(movie, now) for movie in movies]
+        if not rows:
+            return
+        
+        with self._lock, self._conn as conn:
+            # Row by row, so a conflict with a row written earlier in the
+            # same batch is resolved too
+            for row in rows:
+                if row[0] is not None:
+                    conn.execute(_SQL_DELETE_IMDB_CONFLICT, row[:3])
+                conn.execute(_SQL_UPSERT, row)
+            conn.executemany(
+                _SQL_CLEAR_PLATFORMS,
+                ((movie.title, movie.year) for movie in movies)
+            )
+            conn.executemany(_SQL_INSERT_PLATFORM, (
+                (platform, movie.title, movie.year)
+                for movie in movies
+                for platform in movie.streaming_platforms or ()
+            ))
+        
+        if len(rows) >= ANALYZE_BATCH_SIZE:
+            self._analyze()
+    
+    def _movie_to_row(self, movie: MatchedMovie, now: str) -> tuple:
+        """Convert MatchedMovie object to an INSERT parameter tuple"""
+        return (
+            movie.imdb_id,
+            movie.title,
+            movie.year,
+            movie.justwatch_id,
+            _encode_list(movie.streaming_platforms),
+            movie.justwatch_rating,
+            movie.letterboxd_slug,
+            movie.letterboxd_rating,
+            _encode_list(movie.genres),
+            movie.letterboxd_url,
+            now,
+            now
+        )
     
     def clear_expired(self, max_age_hours: int = 168):
         """
@@ -180,21 +549,45 @@ class MovieCache:
         """
         cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
         
-        with sqlite3.connect(self.cache_file) as conn:
-            cursor = conn.execute(
-                "DELETE FROM movies WHERE cached_at < ?",
-                (cutoff,)
-            )
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_DELETE_EXPIRED, (cutoff,))
             deleted = cursor.rowcount
-            conn.commit()
+        
+        if deleted >= ANALYZE_BATCH_SIZE:
+            self._analyze()
         
         return deleted
     
     def clear_all(self):
         """Clear all cache entries"""
-        with sqlite3.connect(self.cache_file) as conn:
-            conn.execute("DELETE FROM movies")
-            conn.commit()
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_DELETE_ALL)
+            conn.execute(_SQL_DELETE_SYNCS)
+    
+    def maintenance(self):
+        """
+        Flush buffered access times, refresh planner statistics and
+        checkpoint the WAL
+        
+        Intended to run after each catalog sync so the -wal file is
+        truncated outside of user-facing requests.
+        """
+        with self._lock:
+            if self._access_buffer:
+                self._flush_access()
+            # optimize may write sqlite_stat1, so checkpoint afterwards
+            self._conn.execute("PRAGMA optimize")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def _analyze(self):
+        """Refresh planner statistics (sqlite_stat1) after bulk changes"""
+        with self._lock:
+            self._conn.execute("ANALYZE")
+    
+    def vacuum(self):
+        """Rebuild the database file to reclaim pages freed by deletes"""
+        with self._lock:
+            self._conn.execute("VACUUM")
     
     def get_stats(self) -> dict:
         """
@@ -203,13 +596,11 @@ class MovieCache:
         Returns:
             Dictionary with cache stats
         """
-        with sqlite3.connect(self.cache_file) as conn:
-            cursor = conn.execute("SELECT COUNT(*) as count FROM movies")
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(_SQL_COUNT)
             count = cursor.fetchone()[0]
             
-            cursor = conn.execute(
-                "SELECT MIN(cached_at) as oldest, MAX(cached_at) as newest FROM movies"
-            )
+            cursor = conn.execute(_SQL_AGE_RANGE)
             row = cursor.fetchone()
             
             return {
@@ -220,17 +611,12 @@ class MovieCache:
     
     def _row_to_movie(self, row: sqlite3.Row) -> MatchedMovie:
         """Convert database row to MatchedMovie object"""
-        return MatchedMovie(
-            title=row['title'],
-            imdb_id=row['imdb_id'],
-            year=row['year'],
-            justwatch_id=row['justwatch_id'],
-            streaming_platforms=json.loads(row['streaming_platforms']) if row['streaming_platforms'] else None,
-            justwatch_rating=row['justwatch_rating'],
-            letterboxd_slug=row['letterboxd_slug'],
-            letterboxd_rating=row['letterboxd_rating'],
-            genres=json.loads(row['genres']) if row['genres'] else None,
-            letterboxd_url=row['letterboxd_url']
+        platforms = row['streaming_platforms']
+        genres = row['genres']
+        return MatchedMovie.from_row(
+            row,
+            streaming_platforms=list(_decode_list(platforms)) if platforms else None,
+            genres=list(_decode_list(genres)) if genres else None
         )
     
     def get_platform_catalog(self, platform: str) -> List[dict]:
@@ -242,19 +628,148 @@ class MovieCache:
         Returns:
             List of movie dicts with platform in streaming_platforms
         """
-        with sqlite3.connect(self.cache_file) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT * FROM movies WHERE streaming_platforms LIKE ?",
-                (f'%{platform}%',)
-            )
+        return list(self.iter_platform_catalog(platform))
+    
+    def iter_platform_catalog(self, platform: str) -> Iterator[dict]:
+        """Stream movies for a streaming platform from cache
+        
+        Rows are read in pages of CATALOG_FETCH_SIZE, and the cache lock is
+        only held while a page is fetched, so other cache calls can run
+        between pages and memory stays bounded by the page size.
+        
+        Args:
+            platform: Platform name (e.g., "Netflix")
+        
+        Yields:
+            Movie dicts with platform in streaming_platforms
+        """
+        last_id = 0
+        while True:
+            with self._lock, self._conn as conn:
+                rows = conn.execute(
+                    _SQL_PLATFORM_CATALOG, (platform, last_id, CATALOG_FETCH_SIZE)
+                ).fetchall()
             
-            movies = []
-            for row in cursor.fetchall():
-                movie = self._row_to_movie(row)
-                movies.append(movie.to_dict())
+            for row in rows:
+                yield self._row_to_movie(row).to_dict()
             
-            return movies
+            if len(rows) < CATALOG_FETCH_SIZE:
+                return
+            last_id = rows[-1]['movie_id']
+    
+    def mark_platform_synced(self, platform: str):
+        """Record that a sync has just written a platform's full catalog
+        
+        Also refreshes cached_at on every movie still on the platform, so
+        retained titles stay inside query_platform's age cutoff.
+        
+        Args:
+            platform: Platform name as stored by the sync (e.g., "Netflix")
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_REFRESH_PLATFORM, (now, platform))
+            conn.execute(_SQL_MARK_SYNCED, (platform, now))
+    
+    def has_platform_catalog(self, platform: str, max_age_hours: int = CATALOG_MAX_AGE_HOURS) -> bool:
+        """Check whether a platform's catalog was synced recently
+        
+        Args:
+            platform: Platform name (e.g., "Netflix"), case-insensitive
+            max_age_hours: Maximum age of the last sync
+        """
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        with self._lock:
+            return self._conn.execute(_SQL_HAS_PLATFORM, (platform, cutoff)).fetchone() is not None
+    
+    def query_platform(
+        self,
+        platform: str,
+        *,
+        year: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        genre: Optional[str] = None,
+        limit: int = 50,
+        max_age_hours: int = CATALOG_MAX_AGE_HOURS
+    ) -> List[MatchedMovie]:
+        """Query cached movies on a platform, filtered and sorted in SQLite
+        
+        Filters match the platform endpoint's: a rating bound excludes
+        unrated movies, and genre must be one of the movie's genres.
+        
+        Args:
+            platform: Platform name (e.g., "Netflix")
+            year: Release year to match
+            min_rating: Minimum Letterboxd rating
+            max_rating: Maximum Letterboxd rating
+            genre: Genre the movie must have
+            limit: Maximum number of movies to return
+            max_age_hours: Maximum age of cached entries
+        
+        Returns:
+            MatchedMovie objects, highest Letterboxd rating first and
+            unrated movies last
+        """
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
+        sql = [_SQL_QUERY_PLATFORM]
+        params: list = [cutoff, platform]
+        if year:
+            sql.append(" AND movies.year = ?")
+            params.append(year)
+        if min_rating is not None or max_rating is not None:
+            # Rated and non-zero, as the in-memory filter requires
+            sql.append(" AND movies.letterboxd_rating != 0")
+            if min_rating is not None:
+                sql.append(" AND movies.letterboxd_rating >= ?")
+                params.append(min_rating)
+            if max_rating is not None:
+                sql.append(" AND movies.letterboxd_rating <= ?")
+                params.append(max_rating)
+        if genre:
+            sql.append(" AND EXISTS (SELECT 1 FROM json_each(movies.genres) WHERE json_each.value = ?)")
+            params.append(genre)
+        sql.append(_SQL_QUERY_PLATFORM_ORDER)
+        params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute("".join(sql), params).fetchall()
+        return [self._row_to_movie(row) for row in rows]
+    
+    def get_title_keys(self, platform: str) -> Set[TitleKey]:
+        """Get (title, year) keys for every cached movie on a platform
+        
+        Reads only the title and year columns, so catalog comparison
+        doesn't pay for JSON decoding or MatchedMovie construction.
+        
+        Args:
+            platform: Platform name (e.g., "Netflix")
+        
+        Returns:
+            Set of keys as built by title_key()
+        """
+        return {title_key(row['title'], row['year']) for row in self._platform_titles(platform)}
+    
+    def get_platform_titles(self, platform: str, keys: Optional[Set[TitleKey]] = None) -> List[dict]:
+        """Get lightweight title records for movies on a platform
+        
+        Args:
+            platform: Platform name (e.g., "Netflix")
+            keys: Optional set of (title, year) keys to restrict results to
+        
+        Returns:
+            List of dicts with title, year and imdb_id
+        """
+        titles = []
+        for row in self._platform_titles(platform):
+            if keys is None or title_key(row['title'], row['year']) in keys:
+                titles.append(dict(row))
+        return titles
+    
+    def _platform_titles(self, platform: str) -> List[sqlite3.Row]:
+        """Fetch (title, year, imdb_id) rows for a platform"""
+        with self._lock, self._conn as conn:
+            return conn.execute(_SQL_PLATFORM_TITLES, (platform,)).fetchall()
     
     def delete(self, key: str):
         """Delete a cache entry by key
@@ -262,14 +777,29 @@ class MovieCache:
         Args:
             key: Cache key (e.g., "imdb:tt1234567" or "title:movie name")
         """
-        # Parse key to determine lookup field
-        if key.startswith("imdb:"):
-            imdb_id = key.replace("imdb:", "")
-            with sqlite3.connect(self.cache_file) as conn:
-                conn.execute("DELETE FROM movies WHERE imdb_id = ?", (imdb_id,))
-                conn.commit()
-        elif key.startswith("title:"):
-            title = key.replace("title:", "")
-            with sqlite3.connect(self.cache_file) as conn:
-                conn.execute("DELETE FROM movies WHERE LOWER(title) = ?", (title.lower(),))
-                conn.commit()
+        self.delete_many([key])
+    
+    def delete_many(self, keys: List[str]):
+        """Delete multiple cache entries in one transaction
+        
+        Keys are grouped by prefix and removed with chunked IN (...) deletes
+        rather than one statement per key.
+        
+        Args:
+            keys: Cache keys (e.g., ["imdb:tt1234567", "title:movie name"])
+        """
+        # Parse keys to determine lookup field
+        imdb_ids = [key[len("imdb:"):] for key in keys if key.startswith("imdb:")]
+        titles = [key[len("title:"):].lower() for key in keys if key.startswith("title:")]
+        if not imdb_ids and not titles:
+            return
+        
+        with self._lock, self._conn as conn:
+            for column, values in (("imdb_id", imdb_ids), ("LOWER(title)", titles)):
+                for i in range(0, len(values), SQL_VARIABLE_CHUNK):
+                    chunk = values[i:i + SQL_VARIABLE_CHUNK]
+                    placeholders = ", ".join("?" * len(chunk))
+                    conn.execute(
+                        f"DELETE FROM movies WHERE {column} IN ({placeholders})",
+                        chunk
+                    )
@@ -7,11 +7,11 @@ from typing import List, Dict, Set, Optional
 from pathlib import Path
 from tqdm import tqdm
 
-from ..cache import MovieCache
+from ..cache import MovieCache, TitleKey, title_key
 from ..scrapers.justwatch_netflix import NetflixScraper
 from ..letterboxd.client import LetterboxdClient
 from ..matcher import MovieMatcher, MatchedMovie
-from ..matcher import MovieMatcher, MatchedMovie
+from ..rate_limit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,9 @@ class CatalogManager:
         scraper: Optional[NetflixScraper] = None,
         letterboxd_client: Optional[LetterboxdClient] = None,
         matcher: Optional[MovieMatcher] = None,
-        log_dir: str = "logs"
+        log_dir: str = "logs",
+        letterboxd_concurrency: int = 4,
+        letterboxd_interval: float = 1.0
     ):
         """Initialize catalog manager with dependencies
         
@@ -35,6 +37,8 @@ class CatalogManager:
             letterboxd_client: LetterboxdClient for rating lookups
             matcher: MovieMatcher for matching movies
             log_dir: Directory for missing movies log
+            letterboxd_concurrency: Maximum in-flight Letterboxd lookups
+            letterboxd_interval: Minimum seconds between Letterboxd requests
         """
         self.cache = cache or MovieCache()
         self.scraper = scraper or NetflixScraper()
@@ -42,6 +46,8 @@ class CatalogManager:
         self.matcher = matcher or MovieMatcher(
             letterboxd_client=self.letterboxd_client
         )
+        self.letterboxd_concurrency = letterboxd_concurrency
+        self.letterboxd_limiter = RateLimiter(letterboxd_interval)
         
         # Set up logging for missing Letterboxd movies
         self.log_dir = Path(log_dir)
@@ -53,19 +59,19 @@ class CatalogManager:
     
     def _setup_missing_logger(self):
         """Configure logger for movies not found on Letterboxd"""
-        missing_logger = logging.getLogger('catalog.missing')
-        missing_logger.setLevel(logging.INFO)
+        self.missing_logger = logging.getLogger('catalog.missing')
+        self.missing_logger.setLevel(logging.INFO)
         
         # Only add handler if not already present
-        if not missing_logger.handlers:
+        if not self.missing_logger.handlers:
             handler = logging.FileHandler(self.missing_log)
             handler.setFormatter(logging.Formatter(
                 '%(asctime)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             ))
-            missing_logger.addHandler(handler)
+            self.missing_logger.addHandler(handler)
     
-    async def sync_netflix_catalog(self) -> Dict[str, any]:
+    async def sync_netflix_catalog(self, use_cache: bool = True) -> Dict[str, any]:
         """Run full Netflix catalog sync workflow
         
         Workflow:
@@ -74,17 +80,32 @@ class CatalogManager:
         3. Query Letterboxd only for new titles
         4. Store matched movies in cache with 48h expiration
         5. Log movies not found on Letterboxd
+        6. Remove titles that left Netflix
+        7. Mark the cached catalog as synced
+        
+        Steps 6 and 7 are skipped when the scrape is empty or a page
+        failed, since missing titles can't be told from removed ones.
+        
+        Args:
+            use_cache: If False, rescrape even when a saved catalog is
+                still fresh
         
         Returns:
-            Dict with sync statistics: new, removed, retained, missing, total
+            Dict with sync statistics: new, removed, retained, missing, total,
+            and whether the scrape was complete
         """
         logger.info("Starting Netflix catalog sync")
         start_time = datetime.now()
         
         # Step 1: Scrape current catalog
         logger.info("Scraping Netflix catalog from JustWatch...")
-        current_titles = await self.scraper.scrape_catalog()
+        current_titles = await self.scraper.scrape_catalog(use_cache=use_cache)
         logger.info(f"Scraped {len(current_titles)} titles from JustWatch")
+        # An empty or partial scrape looks like every missing title left
+        # Netflix, so it may add titles but never remove them
+        complete = bool(current_titles) and self.scraper.last_scrape_complete
+        if not complete:
+            logger.warning("Catalog scrape was empty or incomplete; keeping cached titles")
         
         # Step 2: Load previous catalog and detect changes
         logger.info("Comparing with cached catalog...")
@@ -103,20 +124,28 @@ class CatalogManager:
             logger.info(f"Logging {len(missing)} missing Letterboxd titles...")
             self._log_missing_movies(missing)
         
+        # Steps 6-7 only trust a complete scrape
+        removed = changes['removed'] if complete else []
+        
         # Step 6: Clean up removed titles from cache
-        if changes['removed']:
-            logger.info(f"Removing {len(changes['removed'])} deleted titles from cache...")
-            await self._remove_deleted_titles(changes['removed'])
+        if removed:
+            logger.info(f"Removing {len(removed)} deleted titles from cache...")
+            await self._remove_deleted_titles(removed)
+        
+        # Step 7: Mark the catalog complete so the platform endpoint serves it
+        if complete:
+            self.cache.mark_platform_synced("Netflix")
         
         elapsed = (datetime.now() - start_time).total_seconds()
         
         stats = {
             'new': len(changes['new']),
-            'removed': len(changes['removed']),
+            'removed': len(removed),
             'retained': len(changes['retained']),
             'matched': len(matched),
             'missing': len(missing),
             'total': len(current_titles),
+            'complete': complete,
             'elapsed_seconds': elapsed
         }
         
@@ -137,22 +166,21 @@ class CatalogManager:
         Returns:
             Dict with 'new', 'removed', 'retained' lists
         """
-        # Get cached Netflix titles
-        cached_titles = self.cache.get_platform_catalog("Netflix")
+        # Only title/year keys are needed for the diff; no full rows
+        cached_keys = self.cache.get_title_keys("Netflix")
         
-        # Create sets for comparison (use title as key)
-        current_set = {self._title_key(movie) for movie in current_titles}
-        cached_set = {self._title_key(movie) for movie in cached_titles}
+        # Key each scraped title once (use title as key); duplicates on the
+        # page collapse to a single entry
+        current_map = {self._title_key(movie): movie for movie in current_titles}
         
-        # Detect changes
-        new_keys = current_set - cached_set
-        removed_keys = cached_set - current_set
-        retained_keys = current_set & cached_set
+        # Detect changes, keeping scrape order for new/retained
+        new = [m for k, m in current_map.items() if k not in cached_keys]
+        retained = [m for k, m in current_map.items() if k in cached_keys]
+        removed_keys = cached_keys - current_map.keys()
         
-        # Build title lists from keys
-        new = [m for m in current_titles if self._title_key(m) in new_keys]
-        removed = [m for m in cached_titles if self._title_key(m) in removed_keys]
-        retained = [m for m in current_titles if self._title_key(m) in retained_keys]
+        # Cached records are fetched only for removed titles, which is
+        # usually a small set
+        removed = self.cache.get_platform_titles("Netflix", removed_keys) if removed_keys else []
         
         return {
             'new': new,
@@ -160,17 +188,17 @@ class CatalogManager:
             'retained': retained
         }
     
-    def _title_key(self, movie: Dict) -> str:
+    def _title_key(self, movie: Dict) -> TitleKey:
         """Generate unique key for movie comparison
         
         Args:
             movie: Movie dict with title and optional year
         
         Returns:
-            String key for comparison (title + year)
+            Hashable (title, year) tuple for comparison
         """
-        title = movie.get('title', '').strip().lower()
-        year = movie.get('year', '')
+        return title_key(movie.get('title', ''), movie.get('year'))
+    
     async def _process_new_titles(self, new_titles: List[Dict]) -> tuple[List[MatchedMovie], List[Dict]]:
         """Query Letterboxd for new titles and match them
         
@@ -182,46 +210,50 @@ class CatalogManager:
         """
         matched = []
         missing = []
+        semaphore = asyncio.Semaphore(self.letterboxd_concurrency)
         
         # Progress bar for Letterboxd matching
         with tqdm(total=len(new_titles), desc="Matching with Letterboxd", unit="movie") as pbar:
-            for movie in new_titles:
-                try:
-                    # Try to match by title (IMDb ID not available from scraper)
-                    letterboxd_movie = self.letterboxd_client.get_movie_by_title(
-                        movie['title']
-                    )
-                    
-                    if letterboxd_movie:
-                        # Create MatchedMovie
-                        matched_movie = MatchedMovie(
-                            title=movie['title'],
-                            year=movie.get('year'),
-                            justwatch_id=movie.get('justwatch_id'),
-                            imdb_id=letterboxd_movie.imdb_link.split('/')[-2] if letterboxd_movie.imdb_link else None,
-                            letterboxd_rating=letterboxd_movie.rating,
-                            letterboxd_url=letterboxd_movie.url,
-                            genres=[g['name'] for g in letterboxd_movie.genres] if letterboxd_movie.genres else [],
-                            streaming_platforms=['Netflix']
+            async def process_one(movie: Dict):
+                async with semaphore:
+                    try:
+                        # Rate limiting - respect Letterboxd (1 req/sec)
+                        await self.letterboxd_limiter.acquire()
+                        
+                        # Try to match by title (IMDb ID not available from scraper);
+                        # letterboxdpy is blocking, so run it off the event loop
+                        letterboxd_movie = await asyncio.to_thread(
+                            self.letterboxd_client.get_movie_by_title,
+                            movie['title']
                         )
-                        matched.append(matched_movie)
-                    else:
+                        
+                        if letterboxd_movie:
+                            # Create MatchedMovie
+                            matched_movie = MatchedMovie(
+                                title=movie['title'],
+                                year=movie.get('year'),
+                                justwatch_id=movie.get('justwatch_id'),
+                                imdb_id=letterboxd_movie.imdb_link.split('/')[-2] if letterboxd_movie.imdb_link else None,
+                                letterboxd_rating=letterboxd_movie.rating,
+                                letterboxd_url=letterboxd_movie.url,
+                                genres=[g['name'] for g in letterboxd_movie.genres] if letterboxd_movie.genres else [],
+                                streaming_platforms=['Netflix']
+                            )
+                            matched.append(matched_movie)
+                        else:
+                            missing.append(movie)
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing {movie['title']}: {e}")
                         missing.append(movie)
                     
                     # Update progress bar
                     pbar.update(1)
                     pbar.set_postfix({'matched': len(matched), 'missing': len(missing)})
-                    
-                    # Rate limiting - respect Letterboxd (1 req/sec)
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {movie['title']}: {e}")
-                    missing.append(movie)
-                    pbar.update(1)
+            
+            await asyncio.gather(*(process_one(movie) for movie in new_titles))
         
         return matched, missing
-        return matched, missing
     
     async def _store_matched_movies(self, matched_movies: List[MatchedMovie]):
         """Store matched movies in cache with 48h expiration
@@ -229,9 +261,7 @@ class CatalogManager:
         Args:
             matched_movies: List of MatchedMovie objects to store
         """
-        for movie in matched_movies:
-            self.cache.set(movie)
-
+        self.cache.set_many(matched_movies)
     
     def _log_missing_movies(self, missing_movies: List[Dict]):
         """Log movies not found on Letterboxd to file
@@ -239,12 +269,14 @@ class CatalogManager:
         Args:
             missing_movies: List of movie dicts without Letterboxd matches
         """
-        missing_logger = logging.getLogger('catalog.missing')
-        
+        # Lazy %-formatting: lines are only built if INFO is enabled
+        log = self.missing_logger.info
         for movie in missing_movies:
-            missing_logger.info(
-                f"Netflix: {movie['title']} ({movie.get('year', 'N/A')}) - "
-                f"JustWatch ID: {movie.get('justwatch_id', 'N/A')}"
+            log(
+                "Netflix: %s (%s) - JustWatch ID: %s",
+                movie['title'],
+                movie.get('year', 'N/A'),
+                movie.get('justwatch_id', 'N/A')
             )
     
     async def _remove_deleted_titles(self, removed_titles: List[Dict]):
@@ -253,15 +285,16 @@ class CatalogManager:
         Args:
             removed_titles: List of movie dicts no longer on Netflix
         """
+        keys = []
         for movie in removed_titles:
             # Remove by title
-            title_key = f"title:{movie['title'].lower()}"
-            self.cache.delete(title_key)
+            keys.append(f"title:{movie['title'].lower()}")
             
             # Remove by IMDb ID if available
             if movie.get('imdb_id'):
-                imdb_key = f"imdb:{movie['imdb_id']}"
-                self.cache.delete(imdb_key)
+                keys.append(f"imdb:{movie['imdb_id']}")
+        
+        self.cache.delete_many(keys)
     
     def get_missing_movies(self) -> List[str]:
         """Get list of movies logged as missing from Letterboxd
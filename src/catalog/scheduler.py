@@ -1,5 +1,6 @@
 """Background scheduler for Netflix catalog sync"""
 
+import asyncio
 import logging
 from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -23,9 +24,10 @@ class CatalogScheduler:
         self.catalog_manager = catalog_manager or CatalogManager()
         self.scheduler = AsyncIOScheduler()
         self._sync_job = None
+        self._vacuum_job = None
     
     def start(self):
-        """Start the scheduler with daily 2 AM sync job"""
+        """Start the scheduler with daily 2 AM sync and weekly vacuum jobs"""
         # Add daily sync job at 2 AM
         self._sync_job = self.scheduler.add_job(
             self._run_sync,
@@ -35,6 +37,15 @@ class CatalogScheduler:
             replace_existing=True
         )
         
+        # Reclaim pages freed by removed/expired titles once a week
+        self._vacuum_job = self.scheduler.add_job(
+            self._run_vacuum,
+            trigger=CronTrigger(day_of_week='sun', hour=3, minute=0),
+            id='cache_vacuum',
+            name='Weekly Cache Vacuum',
+            replace_existing=True
+        )
+        
         self.scheduler.start()
         logger.info("Catalog scheduler started - daily sync at 2:00 AM")
     
@@ -59,9 +70,20 @@ class CatalogScheduler:
                 f"{stats['missing']} missing ({elapsed:.1f}s)"
             )
             
+            # Checkpoint WAL and refresh planner stats after the write burst
+            await asyncio.to_thread(self.catalog_manager.cache.maintenance)
+            
         except Exception as e:
             logger.error(f"Scheduled sync failed: {e}", exc_info=True)
     
+    async def _run_vacuum(self):
+        """Run weekly cache vacuum job (called by scheduler)"""
+        try:
+            await asyncio.to_thread(self.catalog_manager.cache.vacuum)
+            logger.info("Cache vacuum complete")
+        except Exception as e:
+            logger.error(f"Cache vacuum failed: {e}", exc_info=True)
+    
     async def run_sync_now(self) -> dict:
         """Manually trigger a sync immediately
         
@@ -69,7 +91,8 @@ class CatalogScheduler:
             Dict with sync statistics
         """
         logger.info("Manual sync triggered")
-        return await self.catalog_manager.sync_netflix_catalog()
+        # A manual trigger asks for a fresh scrape, not the saved catalog
+        return await self.catalog_manager.sync_netflix_catalog(use_cache=False)
     
     def get_next_run_time(self) -> Optional[datetime]:
         """Get next scheduled sync time
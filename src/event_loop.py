@@ -0,0 +1,32 @@
+"""Event loop selection for the scraper entrypoints
+
+Catalog scrapes fan out many concurrent httpx requests, where uvloop's
+libuv-based loop has noticeably less per-callback overhead than asyncio's
+default selector loop. uvloop is optional: without it the stock loop is used.
+uvicorn picks uvloop up on its own when installed, so the web app needs
+nothing from here.
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop
+    _LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    _LOOP_FACTORY = None
+
+T = TypeVar('T')
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion, on uvloop when it is installed
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run(main, loop_factory=_LOOP_FACTORY)
@@ -71,7 +71,8 @@ class JustWatchClient:
         title: str,
         platform: str,
         count: int = 10,
-        best_only: bool = True
+        best_only: bool = True,
+        streaming_only: bool = False
     ) -> List[MediaEntry]:
         """
         Search for movies available on a specific platform
@@ -81,6 +82,8 @@ class JustWatchClient:
             platform: Platform name (e.g., "Netflix", "Hulu", "Amazon Prime")
             count: Maximum number of results
             best_only: If True, only return best quality offers
+            streaming_only: If True, only match subscription (FLATRATE) offers,
+                skipping rent/buy offers for the platform
             
         Returns:
             List of movies available on the specified platform
@@ -88,12 +91,16 @@ class JustWatchClient:
         results = self.search_movies(title, count=count, best_only=best_only)
         
         # Filter by platform
+        platform_lc = platform.lower()
         filtered = []
         for movie in results:
             if movie.offers:
-                # Check if any offer matches the platform
+                # Check if any offer matches the platform; rent/buy offers
+                # are skipped before the name comparison when streaming only
                 for offer in movie.offers:
-                    if platform.lower() in offer.package.name.lower():
+                    if streaming_only and offer.monetization_type != "FLATRATE":
+                        continue
+                    if platform_lc in offer.package.name.lower():
                         filtered.append(movie)
                         break
         
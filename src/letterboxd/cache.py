@@ -0,0 +1,193 @@
+"""Persistent cache for Letterboxd movie pages
+
+Each Movie(slug) lookup scrapes several Letterboxd pages, so the attributes
+the app actually uses are kept in SQLite keyed on slug and reused until they
+expire. Verified IMDb ID -> slug mappings are kept alongside, without expiry,
+so known movies skip the title-to-slug guess.
+"""
+
+import atexit
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, List
+import orjson
+
+
+# Scraped pages change slowly; ratings drift over days, not hours
+DEFAULT_TTL_HOURS = 72
+
+_SQL_GET = "SELECT data FROM letterboxd_movies WHERE slug = ? AND fetched_at >= ?"
+_SQL_SET = """
+    INSERT INTO letterboxd_movies (slug, data, fetched_at) VALUES (?, ?, ?)
+    ON CONFLICT(slug) DO UPDATE SET
+        data = excluded.data,
+        fetched_at = excluded.fetched_at
+"""
+_SQL_DELETE_EXPIRED = "DELETE FROM letterboxd_movies WHERE fetched_at < ?"
+_SQL_GET_SLUG = "SELECT slug FROM imdb_slugs WHERE imdb_id = ?"
+_SQL_SET_SLUG = "INSERT OR REPLACE INTO imdb_slugs (imdb_id, slug) VALUES (?, ?)"
+
+
+@dataclass(slots=True)
+class CachedMovie:
+    """Subset of letterboxdpy Movie attributes restored from the cache
+    
+    Attribute names match Movie, so callers can use either interchangeably.
+    """
+    
+    slug: str
+    title: Optional[str] = None
+    year: Optional[int] = None
+    url: Optional[str] = None
+    rating: Optional[float] = None
+    genres: Optional[List[dict]] = None
+    imdb_link: Optional[str] = None
+    
+    @classmethod
+    def from_movie(cls, movie) -> 'CachedMovie':
+        """
+        Copy the cached attributes from a letterboxdpy Movie
+        
+        Args:
+            movie: letterboxdpy Movie object
+        
+        Returns:
+            CachedMovie object
+        """
+        return cls(
+            slug=movie.slug,
+            title=getattr(movie, 'title', None),
+            year=getattr(movie, 'year', None),
+            url=getattr(movie, 'url', None),
+            rating=getattr(movie, 'rating', None),
+            genres=getattr(movie, 'genres', None),
+            imdb_link=getattr(movie, 'imdb_link', None)
+        )
+
+
+class LetterboxdCache:
+    """SQLite-backed slug -> movie attribute cache"""
+    
+    def __init__(
+        self,
+        cache_file: str = ".cache/letterboxd.db",
+        ttl_hours: int = DEFAULT_TTL_HOURS
+    ):
+        """
+        Initialize Letterboxd cache
+        
+        Args:
+            cache_file: Path to SQLite database file
+            ttl_hours: Hours before a cached movie is fetched again
+        """
+        self.cache_file = cache_file
+        self.ttl_hours = ttl_hours
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        
+        # Shared connection serialized by a lock, as in MovieCache, since
+        # lookups run from worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS letterboxd_movies (
+                    slug TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS imdb_slugs (
+                    imdb_id TEXT PRIMARY KEY,
+                    slug TEXT NOT NULL
+                )
+            """)
+        atexit.register(self.close)
+    
+    def close(self):
+        """Close the shared database connection"""
+        # Drop the exit hook so closed caches (e.g. per-test ones) can be freed
+        atexit.unregister(self.close)
+        with self._lock:
+            self._conn.close()
+    
+    def get(self, slug: str) -> Optional[CachedMovie]:
+        """
+        Get cached movie by slug
+        
+        Args:
+            slug: Letterboxd movie slug
+        
+        Returns:
+            CachedMovie object or None if not cached or expired
+        """
+        cutoff = (datetime.now() - timedelta(hours=self.ttl_hours)).isoformat()
+        
+        with self._lock:
+            row = self._conn.execute(_SQL_GET, (slug, cutoff)).fetchone()
+        
+        if not row:
+            return None
+        return CachedMovie(slug=slug, **orjson.loads(row[0]))
+    
+    def set(self, movie: CachedMovie):
+        """
+        Store movie attributes under its slug
+        
+        Args:
+            movie: CachedMovie object to cache
+        """
+        data = orjson.dumps({
+            'title': movie.title,
+            'year': movie.year,
+            'url': movie.url,
+            'rating': movie.rating,
+            'genres': movie.genres,
+            'imdb_link': movie.imdb_link
+        }).decode()
+        
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_SET, (movie.slug, data, datetime.now().isoformat()))
+    
+    def clear_expired(self) -> int:
+        """
+        Remove entries older than the TTL
+        
+        Returns:
+            Number of entries removed
+        """
+        cutoff = (datetime.now() - timedelta(hours=self.ttl_hours)).isoformat()
+        
+        with self._lock, self._conn as conn:
+            return conn.execute(_SQL_DELETE_EXPIRED, (cutoff,)).rowcount
+    
+    def get_slug(self, imdb_id: str) -> Optional[str]:
+        """
+        Get the Letterboxd slug previously matched to an IMDb ID
+        
+        Args:
+            imdb_id: IMDb ID (e.g., "tt1375666")
+        
+        Returns:
+            Letterboxd slug or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(_SQL_GET_SLUG, (imdb_id,)).fetchone()
+        return row[0] if row else None
+    
+    def set_slug(self, imdb_id: str, slug: str):
+        """
+        Record the Letterboxd slug verified for an IMDb ID
+        
+        Args:
+            imdb_id: IMDb ID (e.g., "tt1375666")
+            slug: Letterboxd movie slug
+        """
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_SET_SLUG, (imdb_id, slug))
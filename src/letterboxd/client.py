@@ -4,19 +4,68 @@ Provides a clean interface to the letterboxdpy library
 with application-specific functionality and error handling.
 """
 
-from typing import Optional
+import logging
+import re
+import unicodedata
+from operator import itemgetter
+from typing import Optional, Union
+import httpx
 from letterboxdpy.movie import Movie
 from letterboxdpy.user import User
 
+from .cache import CachedMovie, LetterboxdCache
+
+logger = logging.getLogger(__name__)
+
+# Characters dropped from slugs: anything but letters, digits, spaces and
+# hyphens. The ASCII class is much cheaper to match than the Unicode one.
+_SLUG_DROP_ASCII = re.compile(r'[^a-z0-9 -]+')
+_SLUG_DROP = re.compile(r'[^\w -]|_')
+# Letters NFKD leaves whole, spelled the way Letterboxd slugs them
+_SLUG_FOLD = str.maketrans({
+    'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ß': 'ss', 'đ': 'd', 'ð': 'd',
+    'ł': 'l', 'þ': 'th', 'ı': 'i'
+})
+# IMDb title IDs inside imdb_link URLs
+_IMDB_ID = re.compile(r'/title/(tt\d+)')
+# Slug in the film URL Letterboxd redirects IMDb lookups to
+_FILM_SLUG = re.compile(r'/film/([^/]+)/?$')
+
+# Letterboxd resolves /imdb/<id>/ to the film page with a redirect
+IMDB_LOOKUP_URL = "https://letterboxd.com/imdb/{imdb_id}/"
+
+# Sentinel for "IMDb ID not parsed yet" (None is a valid parsed result)
+_MISSING = object()
+
+_genre_name = itemgetter('name')
+
 
 class LetterboxdClient:
     """Client for interacting with Letterboxd API"""
     
-    def __init__(self):
-        """Initialize Letterboxd client"""
-        pass
+    def __init__(self, cache: Optional[LetterboxdCache] = None, use_cache: bool = True):
+        """
+        Initialize Letterboxd client
+        
+        Args:
+            cache: Persistent movie cache (creates default if None)
+            use_cache: If False, always fetch from Letterboxd
+        """
+        self.cache = (cache or LetterboxdCache()) if use_cache else None
+        # Only the redirect is read, so nothing past the headers is fetched
+        self._http = httpx.Client(
+            timeout=10.0,
+            follow_redirects=False,
+            headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
+        )
+    
+    def close(self):
+        """Close the HTTP client and the persistent cache"""
+        self._http.close()
+        if self.cache:
+            self.cache.close()
     
-    def get_movie(self, slug: str) -> Optional[Movie]:
+    def get_movie(self, slug: str) -> Optional[Union[Movie, CachedMovie]]:
         """
         Get movie information by Letterboxd slug
         
@@ -24,15 +73,24 @@ class LetterboxdClient:
             slug: Letterboxd movie slug (e.g., "inception")
             
         Returns:
-            Movie object or None if not found
+            Movie object (CachedMovie when served from cache) or None if not found
         """
+        if self.cache:
+            cached = self.cache.get(slug)
+            if cached:
+                return cached
+        
         try:
-            return Movie(slug)
+            movie = Movie(slug)
         except Exception as e:
-            print(f"Error fetching movie '{slug}': {e}")
+            logger.warning("Error fetching movie '%s': %s", slug, e)
             return None
+        
+        if self.cache:
+            self.cache.set(CachedMovie.from_movie(movie))
+        return movie
     
-    def get_movie_by_title(self, title: str) -> Optional[Movie]:
+    def get_movie_by_title(self, title: str) -> Optional[Union[Movie, CachedMovie]]:
         """
         Get movie by title (converts to slug format)
         
@@ -48,6 +106,53 @@ class LetterboxdClient:
         slug = self._title_to_slug(title)
         return self.get_movie(slug)
     
+    def get_slug_by_imdb(self, imdb_id: str) -> Optional[str]:
+        """
+        Resolve an IMDb ID to its Letterboxd slug
+        
+        Args:
+            imdb_id: IMDb ID (e.g., "tt1375666")
+            
+        Returns:
+            Letterboxd slug or None if Letterboxd doesn't know the ID
+        """
+        if self.cache:
+            slug = self.cache.get_slug(imdb_id)
+            if slug:
+                return slug
+        
+        try:
+            response = self._http.head(IMDB_LOOKUP_URL.format(imdb_id=imdb_id))
+        except httpx.HTTPError as e:
+            logger.warning("Error resolving IMDb ID '%s': %s", imdb_id, e)
+            return None
+        
+        match = _FILM_SLUG.search(response.headers.get('location', '')) if response.is_redirect else None
+        if not match:
+            return None
+        
+        slug = match.group(1)
+        if self.cache:
+            self.cache.set_slug(imdb_id, slug)
+        return slug
+    
+    def get_movie_by_imdb(self, imdb_id: str) -> Optional[Union[Movie, CachedMovie]]:
+        """
+        Get movie by IMDb ID
+        
+        Args:
+            imdb_id: IMDb ID (e.g., "tt1375666")
+            
+        Returns:
+            Movie object or None if not found
+            
+        Note:
+            Exact lookup, unlike get_movie_by_title; costs one redirect
+            request on top of get_movie when the slug isn't cached
+        """
+        slug = self.get_slug_by_imdb(imdb_id)
+        return self.get_movie(slug) if slug else None
+    
     def get_rating(self, movie: Movie) -> Optional[float]:
         """
         Extract rating from movie object
@@ -84,6 +189,12 @@ class LetterboxdClient:
         
         try:
             # Genres are dict objects: [{"name": "Action"}, ...]
+            return list(map(_genre_name, movie.genres))
+        except (TypeError, KeyError):
+            pass
+        
+        # Rare mixed list: fall back to per-element dispatch
+        try:
             return [g['name'] if isinstance(g, dict) else str(g) for g in movie.genres]
         except Exception:
             return []
@@ -101,21 +212,26 @@ class LetterboxdClient:
         Note:
             Letterboxd provides imdb_link, need to parse ID from URL
         """
-        if not movie or not hasattr(movie, 'imdb_link'):
+        if not movie:
             return None
         
+        # Parsed once per movie object and memoized on it
+        cached = getattr(movie, '_cached_imdb_id', _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        # Extract ID from URL: http://www.imdb.com/title/tt1375666/maindetails
+        # or https://www.imdb.com/title/tt1375666/
+        imdb_link = getattr(movie, 'imdb_link', None)
+        match = _IMDB_ID.search(imdb_link) if isinstance(imdb_link, str) else None
+        imdb_id = match.group(1) if match else None
+        
         try:
-            imdb_link = movie.imdb_link
-            if imdb_link:
-                # Extract ID from URL: http://www.imdb.com/title/tt1375666/maindetails
-                # or https://www.imdb.com/title/tt1375666/
-                if '/title/' in imdb_link:
-                    # Find the IMDb ID pattern (tt followed by digits)
-                    import re
-                    match = re.search(r'(tt\d+)', imdb_link)
-                    return match.group(1) if match else None
-        except Exception:
-            return None
+            movie._cached_imdb_id = imdb_id
+        except AttributeError:
+            # Slotted objects (e.g. CachedMovie) can't carry the memo
+            pass
+        return imdb_id
     
     def get_user(self, username: str) -> Optional[User]:
         """
@@ -130,7 +246,7 @@ class LetterboxdClient:
         try:
             return User(username)
         except Exception as e:
-            print(f"Error fetching user '{username}': {e}")
+            logger.warning("Error fetching user '%s': %s", username, e)
             return None
     
     @staticmethod
@@ -144,15 +260,15 @@ class LetterboxdClient:
         Returns:
             Slug format (e.g., "the-matrix")
         """
-        # Convert to lowercase and replace spaces with hyphens
-        slug = title.lower().strip()
-        slug = slug.replace(' ', '-')
-        
-        # Remove special characters except hyphens
-        slug = ''.join(c for c in slug if c.isalnum() or c == '-')
-        
-        # Remove duplicate hyphens
-        while '--' in slug:
-            slug = slug.replace('--', '-')
+        # Drop special characters (keeping letters/digits, spaces, hyphens)
+        slug = title.lower()
+        if slug.isascii():
+            slug = _SLUG_DROP_ASCII.sub('', slug)
+        else:
+            # Fold accents like Letterboxd does ("amélie" -> "amelie"): NFKD
+            # splits off combining marks, which the drop pattern removes
+            slug = unicodedata.normalize('NFKD', slug.translate(_SLUG_FOLD))
+            slug = _SLUG_DROP.sub('', slug)
         
-        return slug.strip('-')
+        # Join the words with single hyphens (collapses runs, trims ends)
+        return '-'.join(slug.replace('-', ' ').split())
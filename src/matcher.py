@@ -4,15 +4,22 @@ Matches movies between JustWatch streaming availability and Letterboxd ratings
 using IMDb IDs as the primary key.
 """
 
+import asyncio
+import re
 from typing import Optional, List
 from dataclasses import dataclass
 from src.justwatch.client import JustWatchClient
+from src.letterboxd.cache import LetterboxdCache
 from src.letterboxd.client import LetterboxdClient
 from simplejustwatchapi.query import MediaEntry
 from letterboxdpy.movie import Movie
 
 
-@dataclass
+# Slug segment of a Letterboxd film URL, with or without a trailing slash
+_LB_SLUG = re.compile(r'/film/([^/]+)/?$')
+
+
+@dataclass(slots=True)
 class MatchedMovie:
     """Matched movie data from JustWatch and Letterboxd"""
     
@@ -46,6 +53,41 @@ class MatchedMovie:
             'genres': self.genres,
             'letterboxd_url': self.letterboxd_url
         }
+    
+    @classmethod
+    def from_row(
+        cls,
+        row,
+        streaming_platforms: Optional[List[str]] = None,
+        genres: Optional[List[str]] = None
+    ) -> 'MatchedMovie':
+        """
+        Build from a mapping keyed by field name (e.g. sqlite3.Row)
+        
+        Fields are passed positionally to skip keyword matching on hot
+        paths. List fields are given separately because their stored
+        encoding is up to the caller.
+        
+        Args:
+            row: Mapping with the scalar MatchedMovie fields
+            streaming_platforms: Decoded platform list
+            genres: Decoded genre list
+            
+        Returns:
+            MatchedMovie object
+        """
+        return cls(
+            row['title'],
+            row['imdb_id'],
+            row['year'],
+            row['justwatch_id'],
+            streaming_platforms,
+            row['justwatch_rating'],
+            row['letterboxd_slug'],
+            row['letterboxd_rating'],
+            genres,
+            row['letterboxd_url']
+        )
 
 
 class MovieMatcher:
@@ -54,7 +96,8 @@ class MovieMatcher:
     def __init__(
         self, 
         justwatch_client: Optional[JustWatchClient] = None,
-        letterboxd_client: Optional[LetterboxdClient] = None
+        letterboxd_client: Optional[LetterboxdClient] = None,
+        slug_cache: Optional[LetterboxdCache] = None
     ):
         """
         Initialize movie matcher
@@ -62,9 +105,12 @@ class MovieMatcher:
         Args:
             justwatch_client: JustWatch client instance (creates default if None)
             letterboxd_client: Letterboxd client instance (creates default if None)
+            slug_cache: Store for IMDb ID -> Letterboxd slug matches
+                (defaults to the Letterboxd client's cache, if any)
         """
         self.justwatch = justwatch_client or JustWatchClient()
         self.letterboxd = letterboxd_client or LetterboxdClient()
+        self.slug_cache = slug_cache or getattr(self.letterboxd, 'cache', None)
     
     def match_by_imdb_id(
         self, 
@@ -86,12 +132,19 @@ class MovieMatcher:
         if not imdb_id:
             return None
         
+        # Reuse a slug verified for this IMDb ID on an earlier match
+        if not letterboxd_slug and self.slug_cache:
+            letterboxd_slug = self.slug_cache.get_slug(imdb_id)
+        
         # Get Letterboxd movie
         if letterboxd_slug:
             letterboxd_movie = self.letterboxd.get_movie(letterboxd_slug)
         else:
-            # Try to find by title (fallback method)
-            letterboxd_movie = self.letterboxd.get_movie_by_title(justwatch_movie.title)
+            # Exact IMDb lookup, then the title guess as a fallback
+            letterboxd_movie = (
+                self.letterboxd.get_movie_by_imdb(imdb_id)
+                or self.letterboxd.get_movie_by_title(justwatch_movie.title)
+            )
         
         # Verify IMDb ID match if Letterboxd movie found
         if letterboxd_movie:
@@ -102,6 +155,9 @@ class MovieMatcher:
         else:
             return self._create_partial_match(justwatch_movie, imdb_id)
         
+        if self.slug_cache and getattr(letterboxd_movie, 'slug', None):
+            self.slug_cache.set_slug(imdb_id, letterboxd_movie.slug)
+        
         # Create matched movie object
         return self._create_matched_movie(justwatch_movie, letterboxd_movie, imdb_id)
     
@@ -150,6 +206,85 @@ class MovieMatcher:
         
         return matched_movies
     
+    async def match_platform_movies_async(
+        self,
+        platform: str,
+        count: int = 10,
+        concurrency: int = 8
+    ) -> List[MatchedMovie]:
+        """
+        Get matched movies for a platform, fetching Letterboxd data concurrently
+        
+        Same results and ordering as match_platform_movies, but each
+        match runs in a worker thread (letterboxdpy is blocking) with at
+        most `concurrency` Letterboxd lookups in flight.
+        
+        Args:
+            platform: Platform name (e.g., "Netflix", "Hulu")
+            count: Maximum number of movies to match
+            concurrency: Maximum simultaneous Letterboxd lookups
+            
+        Returns:
+            List of MatchedMovie objects
+        """
+        justwatch_movies = await asyncio.to_thread(
+            self.justwatch.search_by_platform, "", platform, count=count
+        )
+        return await self.match_many_async(justwatch_movies, concurrency=concurrency)
+    
+    async def match_many_async(
+        self,
+        justwatch_movies: List[MediaEntry],
+        concurrency: int = 8
+    ) -> List[MatchedMovie]:
+        """
+        Match JustWatch movies with Letterboxd data concurrently
+        
+        Each match runs match_by_imdb_id in a worker thread (letterboxdpy
+        is blocking) with at most `concurrency` lookups in flight.
+        
+        Args:
+            justwatch_movies: JustWatch MediaEntry objects
+            concurrency: Maximum simultaneous Letterboxd lookups
+            
+        Returns:
+            List of MatchedMovie objects, in input order, without misses
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def match_one(jw_movie: MediaEntry) -> Optional[MatchedMovie]:
+            async with semaphore:
+                return await asyncio.to_thread(self.match_by_imdb_id, jw_movie)
+        
+        results = await asyncio.gather(*(match_one(m) for m in justwatch_movies))
+        return [matched for matched in results if matched]
+    
+    async def match_titles_async(
+        self,
+        titles: List[str],
+        concurrency: int = 8
+    ) -> List[Optional[MatchedMovie]]:
+        """
+        Match movies by title concurrently
+        
+        Each match runs match_by_title in a worker thread (both clients
+        are blocking) with at most `concurrency` lookups in flight.
+        
+        Args:
+            titles: Movie titles to search for
+            concurrency: Maximum simultaneous lookups
+            
+        Returns:
+            MatchedMovie or None for each title, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def match_one(title: str) -> Optional[MatchedMovie]:
+            async with semaphore:
+                return await asyncio.to_thread(self.match_by_title, title)
+        
+        return await asyncio.gather(*(match_one(title) for title in titles))
+    
     def _create_matched_movie(
         self,
         justwatch_movie: MediaEntry,
@@ -164,12 +299,18 @@ class MovieMatcher:
             justwatch_id=justwatch_movie.entry_id,
             streaming_platforms=self.justwatch.get_streaming_platforms(justwatch_movie),
             justwatch_rating=getattr(justwatch_movie, 'rating', None),
-            letterboxd_slug=letterboxd_movie.url.split('/')[-2] if letterboxd_movie.url else None,
+            letterboxd_slug=self._slug_from_url(letterboxd_movie.url),
             letterboxd_rating=self.letterboxd.get_rating(letterboxd_movie),
             genres=self.letterboxd.get_genres(letterboxd_movie),
             letterboxd_url=letterboxd_movie.url
         )
     
+    @staticmethod
+    def _slug_from_url(url: Optional[str]) -> Optional[str]:
+        """Extract the film slug from a Letterboxd URL"""
+        match = _LB_SLUG.search(url) if url else None
+        return match.group(1) if match else None
+    
     def _create_partial_match(
         self,
         justwatch_movie: MediaEntry,
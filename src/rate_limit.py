@@ -0,0 +1,59 @@
+"""Async rate limiting for outbound requests
+
+Shared by components that call external services concurrently so they
+keep an aggregate request rate to JustWatch and Letterboxd.
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Token bucket allowing `burst` acquisitions at once, refilled one
+    per `interval` seconds
+
+    With the default burst of 1 this spaces acquisitions at least
+    `interval` seconds apart across tasks.
+    """
+
+    def __init__(self, interval: float = 1.0, burst: int = 1):
+        """
+        Initialize rate limiter
+
+        Args:
+            interval: Seconds to refill one acquisition
+            burst: Acquisitions allowed back to back before waiting
+        """
+        self.interval = interval
+        self.burst = max(1, burst)
+        self._lock = asyncio.Lock()
+        # Time at which the bucket would be full again (GCRA form of a
+        # token bucket: one timestamp instead of a token count)
+        self._next_slot = 0.0
+
+    @classmethod
+    def per_second(cls, max_rate: float, burst: int = 1) -> 'RateLimiter':
+        """
+        Create a limiter from a rate instead of an interval
+
+        Args:
+            max_rate: Average acquisitions per second (0 disables limiting)
+            burst: Acquisitions allowed back to back before waiting
+        """
+        return cls(1 / max_rate if max_rate > 0 else 0, burst)
+
+    async def acquire(self):
+        """Wait until a request slot is available"""
+        async with self._lock:
+            now = time.monotonic()
+            # Each acquisition pushes the slot one interval further; only
+            # wait once it runs more than the burst allowance ahead
+            slot = max(self._next_slot, now)
+            wait = slot - now - (self.burst - 1) * self.interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+                if self.burst == 1:
+                    # Space from the actual wake-up, so a late one doesn't
+                    # shorten the gap to the next caller
+                    slot = max(slot, time.monotonic())
+            self._next_slot = slot + self.interval
@@ -3,103 +3,473 @@
 Scrapes all Netflix titles from https://www.justwatch.com/us/provider/netflix
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+from html import unescape
 import httpx
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from bs4 import BeautifulSoup, Tag
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import logging
+import os
 import time
 import re
+from pathlib import Path
+import orjson
+
+from ..rate_limit import RateLimiter
+
+try:
+    # C-backed parser, much faster than BeautifulSoup for tag iteration
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    # httpx only decodes brotli bodies when a brotli package is importable
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'br, gzip'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip'
+
+try:
+    # Required by httpx for HTTP/2 (httpx[http2])
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns, shared across every page and link
+_MOVIE_HREF = re.compile(r'/movie/')
+_MOVIE_SLUG = re.compile(r'/movie/([^/?]+)')
+_YEAR = re.compile(r'\b(19|20)\d{2}\b')
+_IMDB_HREF = re.compile(r'imdb\.com/title/(tt\d+)')
+# Plain-text tile links with the text that follows them (where the year
+# sits), matched straight on the response bytes. The link must be the
+# first child of its parent and the text after it must run to the parent's
+# closing tag, so title + tail is exactly the parent text the parser reads.
+_TILE_LINK = re.compile(
+    rb'<[a-z][^>]*>\s*<a\s[^>]*?href="(/[a-z]{2}/movie/[^"]+)"[^>]*>([^<]+)</a>([^<]*)</',
+    re.IGNORECASE
+)
+
+# Responses worth retrying: rate limiting and transient server errors
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _is_retryable(error: httpx.HTTPError) -> bool:
+    """Check whether a failed page request may succeed if repeated"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in _RETRY_STATUS
+    return isinstance(error, httpx.TransportError)
+
 
 class NetflixScraper:
-    """Scraper for JustWatch Netflix catalog"""
+    """Scraper for JustWatch Netflix catalog
+    
+    Use as an async context manager to share one HTTP connection pool
+    across scrape_catalog and get_movie_details calls; otherwise each
+    call opens its own client.
+    """
     
-    def __init__(self, country: str = "us"):
+    def __init__(
+        self,
+        country: str = "us",
+        page_concurrency: int = 5,
+        max_rate: float = 5.0,
+        cache_dir: Optional[str] = ".cache",
+        cache_ttl_hours: float = 12,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0
+    ):
         """
         Initialize Netflix scraper
         
         Args:
             country: Country code (default: "us")
+            page_concurrency: Catalog pages fetched concurrently
+            max_rate: Average page requests per second (0 for no limit)
+            cache_dir: Directory for the scraped catalog and page validator
+                files (None disables both)
+            cache_ttl_hours: Hours a scraped catalog is reused
+            max_retries: Extra attempts for a page that fails transiently
+            retry_backoff: Seconds before the first retry, doubled after each
         """
         self.country = country
+        self.cache_file = Path(cache_dir) / f"netflix_{country}.json" if cache_dir else None
+        # Per-page ETag / Last-Modified plus the movies parsed from that
+        # response, so unchanged pages come back as 304 with no body
+        self.page_cache_file = Path(cache_dir) / f"netflix_{country}_pages.json" if cache_dir else None
+        self._pages: Dict[str, Dict] = {}
+        # Default TTL is kept under a day so the daily scheduled sync
+        # always scrapes fresh; re-runs in between reuse the file
+        self.cache_ttl_hours = cache_ttl_hours
+        self.page_concurrency = page_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        # False when the last scrape_catalog stopped at a failed page, so
+        # callers can tell a partial catalog from a complete one
+        self.last_scrape_complete = False
+        # A whole window of pages may fire at once; the average rate is
+        # still held to max_rate
+        self.page_limiter = RateLimiter.per_second(max_rate, burst=page_concurrency)
         self.base_url = f"https://www.justwatch.com/{country}/provider/netflix"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            'Accept': 'text/html',
+            'Accept-Encoding': _ACCEPT_ENCODING
         }
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self) -> 'NetflixScraper':
+        """Open the shared HTTP client"""
+        self._client = self._new_client()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        """Close the shared HTTP client"""
+        await self._client.aclose()
+        self._client = None
+    
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create an HTTP client with the scraper's headers and timeouts
+        
+        HTTP/2 lets concurrent page fetches share one connection.
+        """
+        return httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=30.0,
+            follow_redirects=True,
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client if open, else a client for this call only"""
+        if self._client is not None:
+            yield self._client
+        else:
+            async with self._new_client() as client:
+                yield client
     
-    async def scrape_catalog(self) -> List[Dict]:
+    async def scrape_catalog(self, use_cache: bool = True) -> List[Dict]:
         """
         Scrape all Netflix titles from JustWatch
         
+        Args:
+            use_cache: If False, ignore a previously saved catalog (pages
+                are still revalidated with conditional requests)
+        
         Returns:
-            List of movie dictionaries with title, year, imdb_id, justwatch_id
+            List of movie dictionaries with title, year, imdb_id, justwatch_id;
+            only the pages before a failed one if last_scrape_complete is False
+        """
+        if use_cache:
+            movies = self._load_cached_catalog()
+            if movies is not None:
+                self.last_scrape_complete = True
+                return movies
+        
+        movies, self.last_scrape_complete = await self._scrape_pages()
+        # A partial catalog would otherwise be reused for the whole TTL
+        if self.last_scrape_complete:
+            self._save_catalog(movies)
+        return movies
+    
+    def _load_cached_catalog(self) -> Optional[List[Dict]]:
+        """
+        Load the saved catalog if it is younger than the TTL
+        
+        Returns:
+            List of movie dictionaries, or None if missing or expired
+        """
+        if self.cache_file is None:
+            return None
+        
+        try:
+            age = time.time() - self.cache_file.stat().st_mtime
+            if age >= self.cache_ttl_hours * 3600:
+                return None
+            movies = orjson.loads(self.cache_file.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable catalog cache {self.cache_file}: {e}")
+            return None
+        
+        logger.info(f"Loaded {len(movies)} movies from catalog cache ({age / 3600:.1f}h old)")
+        return movies
+    
+    def _save_catalog(self, movies: List[Dict]):
+        """
+        Save a scraped catalog for reuse within the TTL
+        
+        Args:
+            movies: List of movie dictionaries
+        """
+        # An empty scrape is almost always a failure; don't pin it
+        if self.cache_file is None or not movies:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so readers never see a partial file
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(orjson.dumps(movies))
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Could not save catalog cache {self.cache_file}: {e}")
+    
+    async def _scrape_pages(self) -> Tuple[List[Dict], bool]:
+        """
+        Scrape every catalog page from JustWatch
+        
+        Returns:
+            Tuple of (movie dictionaries in page order, whether every page
+            up to the end of the catalog was fetched)
         """
         logger.info(f"Starting Netflix catalog scrape from {self.base_url}")
         start_time = time.time()
+        self._pages = self._load_page_cache()
         
         movies = []
         page = 1
+        complete = True
         
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            while True:
-                try:
-                    url = f"{self.base_url}?page={page}"
-                    logger.info(f"Scraping page {page}: {url}")
-                    
-                    response = await client.get(url, headers=self.headers)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.text, 'lxml')
-                    
-                    # Extract movie links directly (tiles don't contain links)
-                    movie_links = soup.find_all('a', href=re.compile(r'/movie/'))
-                    
-                    if not movie_links:
-                        logger.info(f"No more movies found on page {page}, stopping")
+        async with self._session() as client:
+            # JustWatch uses sliding window pagination with no page count, so
+            # pages are fetched in concurrent windows until one comes back
+            # empty; a window may overshoot the end by a few requests
+            done = False
+            while not done:
+                pages = range(page, page + self.page_concurrency)
+                results = await asyncio.gather(*(self._fetch_page(client, p) for p in pages))
+                
+                # Results are consumed in page order. Only an empty page ends
+                # the catalog; a page that failed even after retries (None)
+                # stops the scrape and marks it incomplete
+                for p, page_movies in zip(pages, results):
+                    if page_movies is None:
+                        logger.error(f"Page {p} failed, catalog scrape is incomplete")
+                        complete = False
+                        done = True
+                        break
+                    if not page_movies:
+                        logger.info(f"No more movies found on page {p}, stopping")
+                        done = True
                         break
                     
-                    for link in movie_links:
-                        movie = self._extract_movie_data_from_link(link)
-                        if movie:
-                            movies.append(movie)
-                    
-                    logger.info(f"Page {page}: Found {len(movie_links)} movies (total: {len(movies)})")
-                    
-                    # Continue to next page (no need to check for next page link)
-                    # JustWatch uses sliding window pagination - just keep going until no movies found
-                    page += 1
-                    
-                    # Rate limiting - be respectful (1 req/sec)
-                    import asyncio
-                    await asyncio.sleep(1)
-                    
-                except httpx.HTTPError as e:
-                    logger.error(f"HTTP error on page {page}: {e}")
-                    break
-                except Exception as e:
-                    logger.error(f"Error scraping page {page}: {e}")
-                    break
+                    movies.extend(page_movies)
+                    logger.info(f"Page {p}: Found {len(page_movies)} movies (total: {len(movies)})")
+                
+                page += self.page_concurrency
         
         elapsed = time.time() - start_time
         logger.info(f"Scrape complete: {len(movies)} movies in {elapsed:.2f}s")
         
+        self._save_page_cache()
+        return movies, complete
+    
+    def _load_page_cache(self) -> Dict[str, Dict]:
+        """
+        Load saved page validators and their parsed movies
+        
+        Returns:
+            Dict of page URL -> {'etag', 'last_modified', 'movies'}
+        """
+        if self.page_cache_file is None:
+            return {}
+        
+        try:
+            return orjson.loads(self.page_cache_file.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable page cache {self.page_cache_file}: {e}")
+            return {}
+    
+    def _save_page_cache(self):
+        """Save page validators for conditional requests on the next scrape"""
+        if self.page_cache_file is None or not self._pages:
+            return
+        
+        try:
+            self.page_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.page_cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(orjson.dumps(self._pages))
+            os.replace(tmp_file, self.page_cache_file)
+        except OSError as e:
+            logger.warning(f"Could not save page cache {self.page_cache_file}: {e}")
+    
+    async def _fetch_page(self, client: httpx.AsyncClient, page: int) -> Optional[List[Dict]]:
+        """
+        Fetch one catalog page and extract its movies
+        
+        Transient failures (timeouts, 429, 5xx) are retried with
+        exponential backoff.
+        
+        Args:
+            client: HTTP client to fetch with
+            page: 1-based page number
+            
+        Returns:
+            List of movie dictionaries, or None if the request failed
+        """
+        url = f"{self.base_url}?page={page}"
+        logger.info(f"Scraping page {page}: {url}")
+        
+        # Revalidate pages seen on an earlier scrape
+        cached = self._pages.get(url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        for attempt in range(self.max_retries + 1):
+            # Rate limiting - be respectful across concurrent page requests
+            await self.page_limiter.acquire()
+            try:
+                response = await client.get(url, headers=headers)
+                if response.status_code == 304 and cached:
+                    logger.info(f"Page {page} not modified, reusing parsed movies")
+                    return cached['movies']
+                response.raise_for_status()
+                break
+            except httpx.HTTPError as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    logger.error(f"HTTP error on page {page}: {e}")
+                    return None
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"HTTP error on page {page}: {e}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        
+        try:
+            # Parse on a worker thread so the event loop keeps servicing the
+            # rest of the window's downloads meanwhile
+            movies = await asyncio.to_thread(self._parse_page, response.content)
+            
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+            if etag or last_modified:
+                self._pages[url] = {'etag': etag, 'last_modified': last_modified, 'movies': movies}
+            else:
+                self._pages.pop(url, None)
+            return movies
+            
+        except Exception as e:
+            logger.error(f"Error scraping page {page}: {e}")
+            return None
+    
+    def _parse_page(self, content: bytes) -> List[Dict]:
+        """
+        Extract movies from a catalog page's raw bytes
+        
+        Args:
+            content: Raw page bytes
+            
+        Returns:
+            List of movie dictionaries
+        """
+        # Regular tile markup is matched without building a DOM. Every
+        # movie link contains /movie/, so fewer hits than that means some
+        # links use other markup (or the markup changed) and the parser
+        # below decides
+        movies = self._sweep_movie_links(content)
+        if len(movies) >= content.count(b'/movie/'):
+            return movies
+        
+        # Extract movie links directly (tiles don't contain links);
+        # raw bytes go straight to the parser, skipping the
+        # decoded str copy of the page that response.text builds
+        movie_links = self._find_movie_links(content)
+        
+        # Reduce the links to plain dicts here, so each page's DOM is
+        # freed as soon as it is parsed rather than held until the
+        # whole window has been fetched
+        movies = []
+        for link in movie_links:
+            movie = self._extract_movie_data_from_link(link)
+            if movie:
+                movies.append(movie)
+        return movies
+    
+    @staticmethod
+    def _sweep_movie_links(content: bytes) -> List[Dict]:
+        """
+        Extract movies from a catalog page with a single regex scan
+        
+        Only matches links whose text has no nested markup and which sit
+        alone in their parent; _parse_page sends pages with any other
+        movie links through the HTML parser.
+        
+        Args:
+            content: Raw page bytes
+            
+        Returns:
+            List of movie dictionaries (same shape as
+            _extract_movie_data_from_link)
+        """
+        movies = []
+        for match in _TILE_LINK.finditer(content):
+            href, raw_title, tail = match.groups()
+            title = unescape(raw_title.decode('utf-8', 'replace')).strip()
+            if not title:
+                continue
+            
+            href = unescape(href.decode('utf-8', 'replace'))
+            slug = _MOVIE_SLUG.search(href)
+            # Searched across title and tail, as the parser searches the
+            # parent's text (e.g. "Blade Runner 2049" takes 2049)
+            year = _YEAR.search(unescape((raw_title + tail).decode('utf-8', 'replace')))
+            
+            movies.append({
+                'title': title,
+                'year': int(year.group()) if year else None,
+                'imdb_id': None,
+                'justwatch_id': slug.group(1) if slug else None,
+                'justwatch_url': f"https://www.justwatch.com{href}"
+            })
         return movies
     
+    @staticmethod
+    def _find_movie_links(html) -> list:
+        """
+        Find movie anchor elements in a catalog page
+        
+        Uses selectolax when installed, otherwise BeautifulSoup + lxml.
+        
+        Args:
+            html: Page HTML (str or bytes)
+            
+        Returns:
+            List of anchor elements whose href contains /movie/
+        """
+        if LexborHTMLParser is not None:
+            return LexborHTMLParser(html).css('a[href*="/movie/"]')
+        return BeautifulSoup(html, 'lxml').find_all('a', href=_MOVIE_HREF)
+    
     def _extract_movie_data_from_link(self, link) -> Optional[Dict]:
         """
         Extract movie data from movie link element
         
         Args:
-            link: BeautifulSoup anchor element with movie link
+            link: selectolax node or BeautifulSoup element for a movie link
             
         Returns:
             Dictionary with movie data or None if extraction fails
         """
         try:
-            title = link.get_text(strip=True)
-            href = link.get('href', '')
+            is_bs4 = isinstance(link, Tag)
+            if is_bs4:
+                title = link.get_text(strip=True)
+                href = link.get('href', '')
+            else:
+                title = link.text(strip=True)
+                href = link.attributes.get('href') or ''
             
             if not title or not href:
                 return None
@@ -108,7 +478,7 @@ class NetflixScraper:
             
             # Extract JustWatch ID from URL
             justwatch_id = None
-            match = re.search(r'/movie/([^/?]+)', href)
+            match = _MOVIE_SLUG.search(href)
             if match:
                 justwatch_id = match.group(1)
             
@@ -116,8 +486,8 @@ class NetflixScraper:
             parent = link.parent
             year = None
             if parent:
-                parent_text = parent.get_text()
-                year_match = re.search(r'\b(19|20)\d{2}\b', parent_text)
+                parent_text = parent.get_text() if is_bs4 else parent.text()
+                year_match = _YEAR.search(parent_text)
                 if year_match:
                     year = int(year_match.group())
             
@@ -151,19 +521,26 @@ class NetflixScraper:
         url = f"https://www.justwatch.com/{self.country}/movie/{justwatch_id}"
         
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url, headers=self.headers)
+            async with self._session() as client:
+                response = await client.get(url)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.text, 'lxml')
-                
                 # Extract IMDb ID from page
-                imdb_link = soup.find('a', href=re.compile(r'imdb\.com/title/(tt\d+)'))
+                if LexborHTMLParser is not None:
+                    hrefs = (
+                        node.attributes.get('href') or ''
+                        for node in LexborHTMLParser(response.content).css('a[href*="imdb.com/title/"]')
+                    )
+                else:
+                    soup = BeautifulSoup(response.content, 'lxml')
+                    hrefs = (link.get('href', '') for link in soup.find_all('a', href=_IMDB_HREF))
+                
                 imdb_id = None
-                if imdb_link:
-                    imdb_match = re.search(r'tt\d+', imdb_link.get('href', ''))
+                for href in hrefs:
+                    imdb_match = _IMDB_HREF.search(href)
                     if imdb_match:
-                        imdb_id = imdb_match.group()
+                        imdb_id = imdb_match.group(1)
+                        break
                 
                 return {'imdb_id': imdb_id}
                 
@@ -172,8 +549,6 @@ class NetflixScraper:
             return None
 
 
-import asyncio
-
 async def main():
     """Test scraper"""
     scraper = NetflixScraper()
@@ -186,5 +561,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    from ..event_loop import run
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    run(main())
@@ -1,14 +1,19 @@
 """FastAPI web application for JustWatch + Letterboxd integration"""
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
+from collections import OrderedDict
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional
 from pydantic import BaseModel
+import asyncio
 import time
 import logging
+import orjson
 
 from src.justwatch.client import JustWatchClient
 from src.letterboxd.client import LetterboxdClient
@@ -20,6 +25,26 @@ from src.catalog.scheduler import CatalogScheduler
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_by_rating = attrgetter('letterboxd_rating')
+
+# Common streaming platforms, encoded once since the list never changes
+PLATFORMS = (
+    "Netflix",
+    "Amazon Prime Video",
+    "Hulu",
+    "Disney Plus",
+    "HBO Max",
+    "Apple TV Plus",
+    "Paramount Plus",
+    "Peacock"
+)
+_PLATFORMS_JSON = orjson.dumps(PLATFORMS)
+
+# Recently served /api/movie responses. Kept short-lived because the catalog
+# sync writes through its own MovieCache connection and can't invalidate them.
+MOVIE_MEMO_SIZE = 10_000
+MOVIE_MEMO_TTL_SECONDS = 300
+
 
 # Pydantic models for API responses
 class MovieResponse(BaseModel):
@@ -34,6 +59,26 @@ class MovieResponse(BaseModel):
     letterboxd_rating: Optional[float] = None
     genres: Optional[List[str]] = None
     letterboxd_url: Optional[str] = None
+    
+    @classmethod
+    def from_movie(cls, movie: MatchedMovie) -> 'MovieResponse':
+        """Build from a trusted MatchedMovie without re-validating it
+        
+        Fields are read straight off the dataclass rather than through an
+        intermediate to_dict() copy.
+        """
+        return cls.model_construct(
+            title=movie.title,
+            imdb_id=movie.imdb_id,
+            year=movie.year,
+            justwatch_id=movie.justwatch_id,
+            streaming_platforms=movie.streaming_platforms,
+            justwatch_rating=movie.justwatch_rating,
+            letterboxd_slug=movie.letterboxd_slug,
+            letterboxd_rating=movie.letterboxd_rating,
+            genres=movie.genres,
+            letterboxd_url=movie.letterboxd_url
+        )
 
 
 class PlatformResponse(BaseModel):
@@ -46,6 +91,11 @@ class SearchResponse(BaseModel):
     """Search results response model"""
     movies: List[MovieResponse]
     total: int
+    
+    @classmethod
+    def from_movies(cls, movies: List[MovieResponse]) -> 'SearchResponse':
+        """Wrap already-built movie responses without re-validating them"""
+        return cls.model_construct(movies=movies, total=len(movies))
 
 
 class SyncStatusResponse(BaseModel):
@@ -58,11 +108,58 @@ class SyncStatusResponse(BaseModel):
     missing_log_path: str
 
 
+# Initialize clients and scheduler once per process; every request shares
+# them (and the HTTP and SQLite connections they hold)
+jw_client = JustWatchClient()
+lb_client = LetterboxdClient()
+matcher = MovieMatcher(jw_client, lb_client)
+cache = MovieCache()
+scheduler = CatalogScheduler()
+# IMDb ID -> (expiry on the monotonic clock, response), least recent first
+_movie_memo: 'OrderedDict[str, tuple]' = OrderedDict()
+
+
+def _memo_get(imdb_id: str) -> Optional[MovieResponse]:
+    """Get an unexpired memoized movie response"""
+    entry = _movie_memo.get(imdb_id)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _movie_memo[imdb_id]
+        return None
+    _movie_memo.move_to_end(imdb_id)
+    return entry[1]
+
+
+def _memo_put(imdb_id: str, response: MovieResponse):
+    """Memoize a movie response, evicting the least recently used past the limit"""
+    _movie_memo[imdb_id] = (time.monotonic() + MOVIE_MEMO_TTL_SECONDS, response)
+    _movie_memo.move_to_end(imdb_id)
+    if len(_movie_memo) > MOVIE_MEMO_SIZE:
+        _movie_memo.popitem(last=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background scheduler for the app's lifetime and release
+    shared connections on shutdown"""
+    scheduler.start()
+    logger.info("Application started - catalog scheduler running")
+    try:
+        yield
+    finally:
+        scheduler.stop()
+        lb_client.close()
+        cache.close()
+        logger.info("Application shutdown - catalog scheduler stopped")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="JustWatch + Letterboxd Integration",
     description="Web API for discovering movies with streaming availability and ratings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -74,26 +171,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize clients and scheduler
-jw_client = JustWatchClient()
-lb_client = LetterboxdClient()
-matcher = MovieMatcher(jw_client, lb_client)
-cache = MovieCache()
-scheduler = CatalogScheduler()
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Start background scheduler on app startup"""
-    scheduler.start()
-    logger.info("Application started - catalog scheduler running")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Stop background scheduler on app shutdown"""
-    scheduler.stop()
-    logger.info("Application shutdown - catalog scheduler stopped")
 
 @app.get("/", response_class=HTMLResponse)
 async def root():
@@ -118,18 +195,8 @@ async def get_platforms():
     Returns:
         List of platform names
     """
-    # Common streaming platforms
-    platforms = [
-        "Netflix",
-        "Amazon Prime Video",
-        "Hulu",
-        "Disney Plus",
-        "HBO Max",
-        "Apple TV Plus",
-        "Paramount Plus",
-        "Peacock"
-    ]
-    return platforms
+    # Pre-encoded body, so nothing is serialized per request
+    return Response(content=_PLATFORMS_JSON, media_type="application/json")
 
 
 @app.get("/api/search", response_model=SearchResponse)
@@ -148,18 +215,33 @@ async def search_movies(
         SearchResponse with matched movies
     """
     try:
-        # Search on JustWatch
-        jw_results = jw_client.search_movies(query, count=count)
+        # Search on JustWatch (blocking client, so off the event loop)
+        jw_results = await asyncio.to_thread(jw_client.search_movies, query, count=count)
+        
+        # Serve already-matched movies from cache with one lookup, then
+        # match the rest with Letterboxd concurrently and cache them in one
+        # transaction (titles without an IMDb ID can't be matched)
+        imdb_ids = [jw_client.extract_imdb_id(jw_movie) for jw_movie in jw_results]
+        matched_by_id = cache.get_many(imdb_ids)
+        misses = [
+            jw_movie for jw_movie, imdb_id in zip(jw_results, imdb_ids)
+            if imdb_id and imdb_id not in matched_by_id
+        ]
         
-        # Match with Letterboxd and cache results
-        movies = []
-        for jw_movie in jw_results:
-            matched = matcher.match_by_imdb_id(jw_movie)
-            if matched:
-                movies.append(MovieResponse(**matched.__dict__))
-                cache.set(matched)
+        new_matches = await matcher.match_many_async(misses)
+        if new_matches:
+            cache.set_many(new_matches)
+            for movie in new_matches:
+                _movie_memo.pop(movie.imdb_id, None)
+            matched_by_id.update((m.imdb_id, m) for m in new_matches)
         
-        return SearchResponse(movies=movies, total=len(movies))
+        # In JustWatch's result order
+        movies = [
+            MovieResponse.from_movie(matched_by_id[imdb_id])
+            for imdb_id in dict.fromkeys(imdb_ids)
+            if imdb_id in matched_by_id
+        ]
+        return SearchResponse.from_movies(movies)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -189,56 +271,62 @@ async def get_movies_by_platform(
     start_time = time.time()
     
     try:
+        # Platforms kept by the catalog sync are filtered, sorted and
+        # limited by SQLite; only the rest are matched live
+        if cache.has_platform_catalog(platform):
+            movies = cache.query_platform(
+                platform, year=year, min_rating=min_rating, max_rating=max_rating,
+                genre=genre, limit=count
+            )
+            logger.info(f"Queried {len(movies)} cached {platform} movies in {time.time() - start_time:.2f}s")
+            return SearchResponse.from_movies(list(map(MovieResponse.from_movie, movies)))
+        
         # Get movies from platform
         logger.info(f"Fetching {count} movies from {platform}")
         fetch_start = time.time()
-        movies = matcher.match_platform_movies(platform, count=count)
+        movies = await matcher.match_platform_movies_async(platform, count=count)
         fetch_time = time.time() - fetch_start
         logger.info(f"Fetched {len(movies)} movies in {fetch_time:.2f}s ({fetch_time/len(movies) if movies else 0:.2f}s per movie)")
         
         # Apply filters
+        # Cheapest checks first: year, then rating range, then genre membership.
+        # Survivors come from our own dataclasses, so model_construct skips
+        # re-validating them (the response model is still checked on output)
         filter_start = time.time()
-        filtered_movies = []
-        for movie in movies:
-            # Genre filter
-            if genre and (not movie.genres or genre not in movie.genres):
-                continue
-            
-            # Rating filters
-            if min_rating is not None and (not movie.letterboxd_rating or movie.letterboxd_rating < min_rating):
-                continue
-            if max_rating is not None and (not movie.letterboxd_rating or movie.letterboxd_rating > max_rating):
-                continue
-            
-            # Year filter
-            if year and movie.year != year:
-                continue
-            
-            filtered_movies.append(MovieResponse(**movie.__dict__))
+        lo = min_rating if min_rating is not None else float('-inf')
+        hi = max_rating if max_rating is not None else float('inf')
+        check_rating = min_rating is not None or max_rating is not None
+        construct = MovieResponse.from_movie
+        filtered_movies = [
+            construct(movie)
+            for movie in movies
+            if (not year or movie.year == year)
+            and (not check_rating or (movie.letterboxd_rating and lo <= movie.letterboxd_rating <= hi))
+            and (not genre or (movie.genres and genre in movie.genres))
+        ]
         
         filter_time = time.time() - filter_start
         logger.info(f"Filtered to {len(filtered_movies)} movies in {filter_time:.2f}s")
         
-        # Sort by Letterboxd rating (highest first), movies without rating go to end
+        # Sort by Letterboxd rating (highest first), movies without rating go to end;
+        # partitioning first lets the rated ones sort on a C-level key
         sort_start = time.time()
-        filtered_movies.sort(
-            key=lambda m: (m.letterboxd_rating is not None, m.letterboxd_rating or 0),
-            reverse=True
-        )
+        rated = [m for m in filtered_movies if m.letterboxd_rating is not None]
+        if len(rated) > 1:
+            rated.sort(key=_by_rating, reverse=True)
+        if len(rated) < len(filtered_movies):
+            rated.extend(m for m in filtered_movies if m.letterboxd_rating is None)
+        filtered_movies = rated
         sort_time = time.time() - sort_start
         logger.info(f"Sorted movies in {sort_time:.2f}s")
         
         total_time = time.time() - start_time
         logger.info(f"Total request time: {total_time:.2f}s")
         
-        return SearchResponse(movies=filtered_movies, total=len(filtered_movies))
+        return SearchResponse.from_movies(filtered_movies)
     except Exception as e:
         logger.error(f"Error fetching platform movies: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-        
-        return SearchResponse(movies=filtered_movies, total=len(filtered_movies))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/movie/{imdb_id}", response_model=MovieResponse)
 async def get_movie(imdb_id: str):
@@ -252,10 +340,16 @@ async def get_movie(imdb_id: str):
         MovieResponse with movie details
     """
     try:
-        # Check cache first
+        # Check recent responses, then the cache
+        response = _memo_get(imdb_id)
+        if response:
+            return response
+        
         cached = cache.get(imdb_id)
         if cached:
-            return MovieResponse(**cached.__dict__)
+            response = MovieResponse.from_movie(cached)
+            _memo_put(imdb_id, response)
+            return response
         
         # If not in cache, need to search by title or fetch from APIs
         # Since we can't search JustWatch directly by IMDb ID,
@@ -0,0 +1,120 @@
+"""Shared pytest fixtures
+
+Live clients are created once per test session so JustWatch and Letterboxd
+lookups reuse the same HTTP connections and Letterboxd cache across tests.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from src.cache import MovieCache
+from src.justwatch.client import JustWatchClient
+from src.letterboxd.cache import LetterboxdCache
+from src.letterboxd.client import LetterboxdClient
+from src.matcher import MovieMatcher
+
+try:
+    # Optional: replays repeated requests-based lookups (letterboxdpy) from disk
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+HTTP_CACHE_FILE = Path(__file__).parent / ".http_cache"
+HTTP_CACHE_EXPIRE_SECONDS = 3600
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_cache():
+    """Serve repeat Letterboxd page fetches from an on-disk HTTP cache
+    
+    Only requests traffic is covered; JustWatch's GraphQL client posts
+    through httpx and always hits the network.
+    """
+    if requests_cache is None:
+        yield
+        return
+    requests_cache.install_cache(
+        str(HTTP_CACHE_FILE), backend="sqlite", expire_after=HTTP_CACHE_EXPIRE_SECONDS
+    )
+    yield
+    requests_cache.uninstall_cache()
+
+
+@pytest.fixture(scope="session")
+def jw_client():
+    """JustWatch client shared by every test"""
+    return JustWatchClient()
+
+
+@pytest.fixture(scope="session")
+def lb_client(tmp_path_factory):
+    """Letterboxd client shared by every test
+    
+    Backed by a session-scoped cache file, so tests never read stale entries
+    from (or write into) the developer's .cache/letterboxd.db.
+    """
+    cache_file = tmp_path_factory.mktemp("lb") / "letterboxd.db"
+    client = LetterboxdClient(LetterboxdCache(str(cache_file)))
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def matcher(jw_client, lb_client):
+    """Movie matcher built on the shared clients"""
+    return MovieMatcher(jw_client, lb_client)
+
+
+@pytest.fixture(scope="session")
+def shared_cache():
+    """In-memory movie cache whose schema is built once per session"""
+    movie_cache = MovieCache(":memory:")
+    yield movie_cache
+    movie_cache.close()
+
+
+@pytest.fixture
+def cache(shared_cache):
+    """Empty in-memory movie cache for each test
+    
+    Reuses the session database and clears it, rather than rebuilding
+    the schema per test. Tests that exercise WAL and on-disk behavior
+    build a file-backed MovieCache instead.
+    """
+    shared_cache.clear_all()
+    return shared_cache
+
+
+@pytest.fixture(scope="session")
+def inception_lookups(jw_client, lb_client):
+    """Inception on JustWatch and Letterboxd, fetched concurrently once per session
+    
+    The two lookups are independent network calls, so overlapping them
+    costs the slower one rather than both.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        jw_future = executor.submit(jw_client.search_movies, "Inception", count=1)
+        lb_future = executor.submit(lb_client.get_movie, "inception")
+    return jw_future.result(), lb_future.result()
+
+
+@pytest.fixture(scope="session")
+def inception_jw(inception_lookups):
+    """JustWatch search result for Inception"""
+    results = inception_lookups[0]
+    assert results, "JustWatch search for Inception returned nothing"
+    return results[0]
+
+
+@pytest.fixture(scope="session")
+def inception_lb(inception_lookups):
+    """Letterboxd movie for Inception"""
+    movie = inception_lookups[1]
+    assert movie is not None, "Letterboxd lookup for inception failed"
+    return movie
+
+
+@pytest.fixture(scope="session")
+def inception_matched(matcher):
+    """Inception matched by title across both services, once per session"""
+    return matcher.match_by_title("Inception")
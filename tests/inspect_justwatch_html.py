@@ -5,9 +5,22 @@ Fetches the page and analyzes HTML to determine correct selectors for scraping.
 """
 
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import asyncio
 
+# Same selectors the scraper uses for movie links and tiles
+_MOVIE_LINKS = 'a[href*="/movie/"]'
+_TILES = 'div.title-list-grid__item'
+
+# Candidate container selectors to try
+CONTAINER_SELECTORS = (
+    (_TILES, 'Original selector'),
+    ('div[class*="title"]', 'Divs with "title" in class'),
+    (_MOVIE_LINKS, 'Links to movie pages'),
+    ('article', 'Article elements'),
+    ('div[class*="grid"]', 'Divs with "grid" in class'),
+)
+
 
 async def inspect_page():
     """Fetch and inspect JustWatch Netflix page"""
@@ -22,51 +35,44 @@ async def inspect_page():
         response = await client.get(url, headers=headers)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'lxml')
+        tree = LexborHTMLParser(response.content)
         
         # Look for movie containers with various selectors
         print("=== Searching for movie containers ===\n")
         
-        # Try different selectors
-        selectors = [
-            ('div.title-list-grid__item', 'Original selector'),
-            ('div[class*="title"]', 'Divs with "title" in class'),
-            ('a[href*="/movie/"]', 'Links to movie pages'),
-            ('article', 'Article elements'),
-            ('div[class*="grid"]', 'Divs with "grid" in class'),
-        ]
-        
-        for selector, description in selectors:
-            elements = soup.select(selector)
+        # Try different selectors; each tree walk is kept so the sections
+        # below reuse the link and tile matches instead of querying again
+        found = {}
+        for selector, description in CONTAINER_SELECTORS:
+            elements = found[selector] = tree.css(selector)
             print(f"{description} ({selector}): {len(elements)} found")
             if elements and len(elements) <= 5:
-                print(f"  Sample classes: {elements[0].get('class')}")
+                print(f"  Sample classes: {elements[0].attributes.get('class')}")
         
         print("\n=== Analyzing first 3 movie links ===\n")
         
-        # Find movie links
-        movie_links = soup.find_all('a', href=lambda x: x and '/movie/' in x)[:3]
+        # First movie links (also used for the container walk below)
+        movie_links = found[_MOVIE_LINKS][:3]
         
         for i, link in enumerate(movie_links, 1):
             print(f"Movie {i}:")
-            print(f"  Title: {link.get('title', 'N/A')}")
-            print(f"  Href: {link.get('href', 'N/A')}")
-            print(f"  Text: {link.get_text(strip=True)[:50]}")
+            print(f"  Title: {link.attributes.get('title') or 'N/A'}")
+            print(f"  Href: {link.attributes.get('href') or 'N/A'}")
+            print(f"  Text: {link.text(strip=True)[:50]}")
             
             # Check parent containers
             parent = link.parent
             for _ in range(3):  # Check 3 levels up
                 if parent:
-                    classes = parent.get('class', [])
+                    classes = parent.attributes.get('class')
                     if classes:
-                        print(f"  Parent class: {' '.join(classes)}")
+                        print(f"  Parent class: {classes}")
                     parent = parent.parent
             print()
         
         print("\n=== Looking for title containers ===\n")
         
         # Try to find the actual container structure
-        movie_links = soup.find_all('a', href=lambda x: x and '/movie/' in x)[:1]
         if movie_links:
             link = movie_links[0]
             
@@ -74,25 +80,24 @@ async def inspect_page():
         print("\n=== Examining first tile structure ===\n")
         
         # Get first tile
-        tiles = soup.find_all('div', class_='title-list-grid__item')
+        tiles = found[_TILES]
         if tiles:
             tile = tiles[0]
-            print(f"Tile found: {tile.name}")
-            print(f"Tile classes: {tile.get('class')}")
+            print(f"Tile found: {tile.tag}")
+            print(f"Tile classes: {tile.attributes.get('class')}")
             
             # Look for links in tile
-            links = tile.find_all('a', href=re.compile(r'/movie/'))
+            links = tile.css(_MOVIE_LINKS)
             print(f"Links in tile: {len(links)}")
             
             if links:
                 link = links[0]
-                print(f"  Link text: {link.get_text(strip=True)}")
-                print(f"  Link href: {link.get('href')}")
+                print(f"  Link text: {link.text(strip=True)}")
+                print(f"  Link href: {link.attributes.get('href')}")
             else:
                 print("  No movie links found in tile!")
-                print(f"  Tile HTML: {tile.prettify()[:500]}")
+                print(f"  Tile HTML: {tile.html[:500]}")
 
 
 if __name__ == "__main__":
-    import re
     asyncio.run(inspect_page())
@@ -2,10 +2,13 @@
 """Inspect JustWatch pagination to understand why it stops after page 1"""
 
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import asyncio
 import re
 
+# Text nodes that look like a result count ("1234 titles")
+_COUNT_TEXT = re.compile(r'\d+\s*(titles|movies|results)')
+
 
 async def inspect_pagination():
     """Check pagination structure on JustWatch Netflix page"""
@@ -20,7 +23,7 @@ async def inspect_pagination():
         response = await client.get(url, headers=headers)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'lxml')
+        tree = LexborHTMLParser(response.content)
         
         print("=== Searching for pagination elements ===\n")
         
@@ -35,29 +38,41 @@ async def inspect_pagination():
         ]
         
         for selector, description in selectors:
-            elements = soup.select(selector)
+            elements = tree.css(selector)
             print(f"{description} ({selector}): {len(elements)} found")
             if elements:
                 for elem in elements[:2]:
-                    print(f"  Element: {elem.name}, class: {elem.get('class')}, href: {elem.get('href')}")
+                    print(f"  Element: {elem.tag}, class: {elem.attributes.get('class')}, href: {elem.attributes.get('href')}")
         
         print("\n=== Checking for lazy loading/JavaScript ===\n")
         
         # Check for data attributes that might indicate dynamic loading
-        data_attrs = soup.find_all(attrs={"data-page": True})
+        data_attrs = tree.css('[data-page]')
         print(f"Elements with data-page: {len(data_attrs)}")
         
         # Check script tags for pagination config
-        scripts = soup.find_all('script')
+        scripts = tree.css('script')
         print(f"Script tags: {len(scripts)}")
         for script in scripts[:3]:
-            if script.string and ('page' in script.string.lower() or 'pagination' in script.string.lower()):
+            code = script.text().lower()
+            if 'page' in code or 'pagination' in code:
                 print(f"  Script contains pagination-related code")
         
         print("\n=== Checking total movies available ===\n")
         
         # Look for total count indicators
-        count_indicators = soup.find_all(text=re.compile(r'\d+\s*(titles|movies|results)'))
+        # Plain substring checks (C-level) shortlist the text nodes so the
+        # regex only runs on the few that mention a count word
+        text_nodes = (
+            node.text_content
+            for node in tree.root.traverse(include_text=True)
+            if node.is_text_node
+        )
+        count_indicators = [
+            text for text in text_nodes
+            if ('titles' in text or 'movies' in text or 'results' in text)
+            and _COUNT_TEXT.search(text)
+        ]
         print(f"Count indicators found: {len(count_indicators)}")
         for indicator in count_indicators[:3]:
             print(f"  - {indicator.strip()}")
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Test suite for movie cache"""
 
+import gc
 import pytest
 import tempfile
 import os
+import weakref
 from datetime import datetime, timedelta
 from src.cache import MovieCache
 from src.matcher import MatchedMovie
@@ -14,7 +16,9 @@ def temp_cache():
     """Create temporary cache for testing"""
     with tempfile.TemporaryDirectory() as tmpdir:
         cache_file = os.path.join(tmpdir, "test_cache.db")
-        yield MovieCache(cache_file)
+        cache = MovieCache(cache_file)
+        yield cache
+        cache.close()
 
 
 @pytest.fixture
@@ -40,6 +44,22 @@ def test_cache_initialization(temp_cache):
     assert os.path.exists(temp_cache.cache_file)
 
 
+def test_close_releases_cache():
+    """Test a closed cache isn't kept alive by its exit hook"""
+    cache = MovieCache(":memory:")
+    ref = weakref.ref(cache)
+    cache.close()
+    del cache
+    gc.collect()
+    assert ref() is None
+
+
+def test_wal_journal_mode(temp_cache):
+    """Test cache database uses write-ahead logging"""
+    mode = temp_cache._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
 def test_set_and_get(temp_cache, sample_movie):
     """Test storing and retrieving movie from cache"""
     # Store movie
@@ -63,6 +83,21 @@ def test_get_by_title(temp_cache, sample_movie):
     
     assert cached is not None
     assert cached.imdb_id == sample_movie.imdb_id
+    
+    # Case-insensitive substring matches, as with LIKE '%title%'
+    assert temp_cache.get_by_title("incep").imdb_id == sample_movie.imdb_id
+    assert temp_cache.get_by_title("Interstellar") is None
+
+
+def test_get_by_title_follows_updates(temp_cache, sample_movie):
+    """Test title index tracks renamed and deleted movies"""
+    temp_cache.set(sample_movie)
+    temp_cache.set(MatchedMovie(title="Inception (2010)", imdb_id=sample_movie.imdb_id, year=2010))
+    
+    assert temp_cache.get_by_title("(2010)").imdb_id == sample_movie.imdb_id
+    
+    temp_cache.delete(f"imdb:{sample_movie.imdb_id}")
+    assert temp_cache.get_by_title("Inception") is None
 
 
 def test_cache_expiration(temp_cache, sample_movie):
@@ -76,6 +111,10 @@ def test_cache_expiration(temp_cache, sample_movie):
     # Should be expired with very short max_age
     cached = temp_cache.get(sample_movie.imdb_id, max_age_hours=0)
     assert cached is None
+    
+    # Title lookups apply the same expiry
+    assert temp_cache.get_by_title("Inception", max_age_hours=24) is not None
+    assert temp_cache.get_by_title("Inception", max_age_hours=0) is None
 
 
 def test_set_many(temp_cache):
@@ -107,18 +146,105 @@ def test_set_many(temp_cache):
         assert cached.title == movie.title
 
 
+def test_set_many_is_transactional(temp_cache):
+    """Test a bulk write is one transaction, not one commit per movie"""
+    statements = []
+    temp_cache._conn.set_trace_callback(statements.append)
+    temp_cache.set_many([
+        MatchedMovie(title=f"Movie {i}", imdb_id=f"tt{i:07d}", streaming_platforms=["Netflix"])
+        for i in range(100)
+    ])
+    temp_cache._conn.set_trace_callback(None)
+    
+    # Trigger bodies are traced as "--" comments; ANALYZE runs afterwards
+    writes = [sql for sql in statements if not sql.startswith("--") and sql != "ANALYZE"]
+    assert writes[0].strip() == "BEGIN"
+    assert writes[-1] == "COMMIT"
+    assert sum(sql.strip() in ("BEGIN", "COMMIT") for sql in writes) == 2
+    assert temp_cache.get_stats()['total_entries'] == 100
+
+
+def test_set_many_imdb_collision(temp_cache):
+    """Test a movie matching one row by title and another by IMDb ID"""
+    temp_cache.set_many([
+        MatchedMovie(title="Solaris", year=1972, imdb_id="tt0069293", streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Solaris (1972)", year=1972, imdb_id="tt9999999", streaming_platforms=["Netflix"]),
+    ])
+    
+    # Row A by (title, year), row B by IMDb ID: B is replaced, not a batch failure
+    temp_cache.set_many([
+        MatchedMovie(title="Solaris (1972)", year=1972, imdb_id="tt0069293", streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Stalker", year=1979, imdb_id="tt0079944", streaming_platforms=["Netflix"]),
+    ])
+    
+    assert temp_cache.get_stats()['total_entries'] == 2
+    assert temp_cache.get("tt0069293").title == "Solaris (1972)"
+    assert temp_cache.get("tt9999999") is None
+    assert temp_cache.get("tt0079944") is not None
+    assert len(temp_cache.get_platform_catalog("Netflix")) == 2
+
+
+def test_recache_undated_title(temp_cache):
+    """Test a title without a year or IMDb ID is updated in place, not duplicated"""
+    for rating in (3.0, 3.5, 4.0):
+        temp_cache.set(MatchedMovie(title="Undated", letterboxd_rating=rating, streaming_platforms=["Netflix"]))
+    
+    assert temp_cache.get_stats()['total_entries'] == 1
+    assert temp_cache.get_by_title("Undated").letterboxd_rating == 4.0
+    assert len(temp_cache.get_platform_catalog("Netflix")) == 1
+
+
+def test_get_many(temp_cache, monkeypatch):
+    """Test batched lookups return found, unexpired movies keyed by IMDb ID"""
+    temp_cache.set_many([
+        MatchedMovie(title=f"Movie {i}", imdb_id=f"tt{i:07d}", genres=["Drama"])
+        for i in range(5)
+    ])
+    
+    # Small chunks force several IN (...) queries
+    monkeypatch.setattr("src.cache.SQL_VARIABLE_CHUNK", 2)
+    found = temp_cache.get_many(["tt0000000", "tt0000003", "tt9999999", None, "tt0000003", "tt0000004"])
+    
+    assert sorted(found) == ["tt0000000", "tt0000003", "tt0000004"]
+    assert found["tt0000003"].title == "Movie 3"
+    assert found["tt0000003"].genres == ["Drama"]
+    assert temp_cache.get_many([]) == {}
+    
+    # Expired entries are skipped
+    assert temp_cache.get_many(["tt0000000"], max_age_hours=0) == {}
+
+
+def test_set_many_empty(temp_cache):
+    """Test storing an empty batch is a no-op"""
+    temp_cache.set_many([])
+    
+    stats = temp_cache.get_stats()
+    assert stats['total_entries'] == 0
+
+
+def test_imdb_id_unique(temp_cache):
+    """Test a movie re-cached under a new title replaces the old row"""
+    temp_cache.set(MatchedMovie(title="Se7en", imdb_id="tt0114369", year=1995))
+    temp_cache.set(MatchedMovie(title="Seven", imdb_id="tt0114369", year=1995))
+    
+    assert temp_cache.get_stats()['total_entries'] == 1
+    assert temp_cache.get("tt0114369").title == "Seven"
+
+
 def test_update_existing(temp_cache, sample_movie):
     """Test updating existing cache entry"""
     # Store initial version
     temp_cache.set(sample_movie)
+    row_id = temp_cache._conn.execute("SELECT id FROM movies").fetchone()[0]
     
     # Update movie data
     sample_movie.letterboxd_rating = 4.5
     temp_cache.set(sample_movie)
     
-    # Verify updated
+    # Verify updated in place
     cached = temp_cache.get(sample_movie.imdb_id)
     assert cached.letterboxd_rating == 4.5
+    assert temp_cache._conn.execute("SELECT id FROM movies").fetchone()[0] == row_id
 
 
 def test_clear_expired(temp_cache, sample_movie):
@@ -144,6 +270,25 @@ def test_clear_all(temp_cache, sample_movie):
     assert cached is None
 
 
+def test_delete_many(temp_cache):
+    """Test bulk deletion by IMDb ID and title keys"""
+    movies = [
+        MatchedMovie(title=f"Movie {i}", imdb_id=f"tt{i:07d}", year=2000)
+        for i in range(1000)
+    ]
+    temp_cache.set_many(movies)
+    
+    # More keys than one IN (...) chunk holds
+    keys = [f"imdb:{m.imdb_id}" for m in movies[:950]]
+    keys += ["title:movie 999", "unknown:key"]
+    temp_cache.delete_many(keys)
+    
+    assert temp_cache.get_stats()['total_entries'] == 49
+    assert temp_cache.get("tt0000949") is None
+    assert temp_cache.get("tt0000999") is None
+    assert temp_cache.get("tt0000950") is not None
+
+
 def test_get_stats(temp_cache, sample_movie):
     """Test cache statistics"""
     # Empty cache
@@ -172,6 +317,179 @@ def test_json_serialization(temp_cache, sample_movie):
     assert cached.genres == sample_movie.genres
 
 
+def test_get_platform_catalog(temp_cache, sample_movie):
+    """Test platform catalog lookup through the platforms table"""
+    other = MatchedMovie(
+        title="Netflix Documentary",
+        imdb_id="tt7777777",
+        year=2021,
+        streaming_platforms=["Netflix basic with Ads"]
+    )
+    temp_cache.set_many([sample_movie, other])
+    
+    netflix = temp_cache.get_platform_catalog("Netflix")
+    assert [m['title'] for m in netflix] == ["Inception"]
+    
+    # Replacing a movie must not leave stale platform rows behind
+    sample_movie.streaming_platforms = ["Hulu"]
+    temp_cache.set(sample_movie)
+    assert temp_cache.get_platform_catalog("Netflix") == []
+    assert len(temp_cache.get_platform_catalog("Hulu")) == 1
+
+
+def test_query_platform(temp_cache):
+    """Test platform queries filter, sort and limit in SQL"""
+    temp_cache.set_many([
+        MatchedMovie(title="Unrated", year=2010, genres=["Drama"], streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Good", year=2010, letterboxd_rating=3.5, genres=["Drama"], streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Best", year=2011, letterboxd_rating=4.5, genres=["Comedy"], streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Also Good", year=2010, letterboxd_rating=3.5, streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Zero", year=2010, letterboxd_rating=0.0, genres=["Drama"], streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Elsewhere", year=2010, letterboxd_rating=5.0, streaming_platforms=["Hulu"]),
+    ])
+    
+    def titles(**filters):
+        return [m.title for m in temp_cache.query_platform("Netflix", **filters)]
+    
+    assert titles() == ["Best", "Good", "Also Good", "Zero", "Unrated"]
+    assert titles(limit=2) == ["Best", "Good"]
+    assert titles(year=2010) == ["Good", "Also Good", "Zero", "Unrated"]
+    assert titles(min_rating=0) == ["Best", "Good", "Also Good"]
+    assert titles(max_rating=4) == ["Good", "Also Good"]
+    assert titles(genre="Drama") == ["Good", "Zero", "Unrated"]
+    assert titles(year=2010, min_rating=3, genre="Drama") == ["Good"]
+
+
+def test_query_platform_matching_and_expiry(temp_cache):
+    """Test platform names match case-insensitively and stale rows are skipped"""
+    temp_cache.set_many([
+        MatchedMovie(title="Plain", letterboxd_rating=4.0, streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Ads", letterboxd_rating=3.0, streaming_platforms=["Netflix basic with Ads", "Netflix"]),
+        MatchedMovie(title="Stale", letterboxd_rating=2.0, streaming_platforms=["Netflix"]),
+    ])
+    old = (datetime.now() - timedelta(hours=100)).isoformat()
+    temp_cache._conn.execute("UPDATE movies SET cached_at = ? WHERE title = 'Stale'", (old,))
+    
+    # Matching both package names still returns the movie once
+    assert [m.title for m in temp_cache.query_platform("netflix")] == ["Plain", "Ads"]
+    assert [m.title for m in temp_cache.query_platform("netflix", max_age_hours=200)] == ["Plain", "Ads", "Stale"]
+
+
+def test_platform_catalog_marker(temp_cache):
+    """Test only synced platforms count as having a cached catalog"""
+    temp_cache.set_many([
+        MatchedMovie(title="Synced", streaming_platforms=["Netflix"]),
+        MatchedMovie(title="Searched", streaming_platforms=["Hulu"]),
+    ])
+    old = (datetime.now() - timedelta(hours=100)).isoformat()
+    temp_cache._conn.execute("UPDATE movies SET cached_at = ?", (old,))
+    
+    # Search results fill movie_platforms too, but aren't a full catalog
+    assert not temp_cache.has_platform_catalog("Netflix")
+    assert not temp_cache.has_platform_catalog("Hulu")
+    
+    temp_cache.mark_platform_synced("Netflix")
+    assert temp_cache.has_platform_catalog("netflix")
+    assert not temp_cache.has_platform_catalog("Hulu")
+    assert not temp_cache.has_platform_catalog("Netflix", max_age_hours=0)
+    
+    # Syncing refreshes retained titles, so they pass the age cutoff
+    assert [m.title for m in temp_cache.query_platform("Netflix")] == ["Synced"]
+    assert temp_cache.query_platform("Hulu", max_age_hours=200)[0].title == "Searched"
+    assert temp_cache.query_platform("Hulu") == []
+    
+    temp_cache.clear_all()
+    assert not temp_cache.has_platform_catalog("Netflix")
+
+
+def test_access_times_buffered(temp_cache, sample_movie, monkeypatch):
+    """Test get() buffers last_accessed and flushes it in batches"""
+    temp_cache.set(sample_movie)
+    
+    def last_accessed():
+        return temp_cache._conn.execute(
+            "SELECT last_accessed FROM movies WHERE imdb_id = ?", (sample_movie.imdb_id,)
+        ).fetchone()[0]
+    
+    written = last_accessed()
+    assert temp_cache.get(sample_movie.imdb_id) is not None
+    assert last_accessed() == written
+    
+    temp_cache.maintenance()
+    assert last_accessed() > written
+    
+    # Reaching the buffer size triggers a write-back
+    monkeypatch.setattr("src.cache.ACCESS_FLUSH_SIZE", 1)
+    flushed = last_accessed()
+    temp_cache.get(sample_movie.imdb_id)
+    assert last_accessed() > flushed
+
+
+def test_bulk_set_analyzes(temp_cache):
+    """Test bulk writes populate planner statistics"""
+    temp_cache.set_many([
+        MatchedMovie(title=f"Movie {i}", imdb_id=f"tt{i:07d}", streaming_platforms=["Netflix"])
+        for i in range(100)
+    ])
+    
+    stats = temp_cache._conn.execute("SELECT tbl FROM sqlite_stat1").fetchall()
+    assert "movies" in {row[0] for row in stats}
+
+
+def test_maintenance(temp_cache, sample_movie):
+    """Test WAL checkpoint, optimize and vacuum leave the cache usable"""
+    temp_cache.set(sample_movie)
+    temp_cache.clear_all()
+    temp_cache.set(sample_movie)
+    
+    temp_cache.maintenance()
+    assert os.path.getsize(temp_cache.cache_file + "-wal") == 0
+    
+    temp_cache.vacuum()
+    assert temp_cache.get(sample_movie.imdb_id) is not None
+
+
+def test_iter_platform_catalog_pages(temp_cache, monkeypatch):
+    """Test streamed catalog spans pages and releases the lock between them"""
+    monkeypatch.setattr("src.cache.CATALOG_FETCH_SIZE", 2)
+    temp_cache.set_many([
+        MatchedMovie(title=f"Movie {i}", imdb_id=f"tt{i:07d}", streaming_platforms=["Netflix"])
+        for i in range(5)
+    ])
+    
+    titles = []
+    for movie in temp_cache.iter_platform_catalog("Netflix"):
+        # Other cache calls must not deadlock mid-iteration
+        assert temp_cache.get_stats()['total_entries'] == 5
+        titles.append(movie['title'])
+    
+    assert titles == [f"Movie {i}" for i in range(5)]
+
+
+def test_get_title_keys(temp_cache, sample_movie):
+    """Test title keys and removed-title lookup for catalog diffs"""
+    undated = MatchedMovie(title=" Undated Film ", streaming_platforms=["Netflix"])
+    temp_cache.set_many([sample_movie, undated])
+    
+    keys = temp_cache.get_title_keys("Netflix")
+    assert keys == {("inception", 2010), ("undated film", None)}
+    assert temp_cache.get_title_keys("Hulu") == {("inception", 2010)}
+    
+    removed = temp_cache.get_platform_titles("Netflix", {("undated film", None)})
+    assert removed == [{'title': " Undated Film ", 'year': None, 'imdb_id': None}]
+
+
+def test_decoded_lists_not_shared(temp_cache, sample_movie):
+    """Test memoized JSON decoding returns independent lists"""
+    temp_cache.set(sample_movie)
+    
+    first = temp_cache.get(sample_movie.imdb_id)
+    first.genres.append("Drama")
+    
+    second = temp_cache.get(sample_movie.imdb_id)
+    assert second.genres == sample_movie.genres
+
+
 def test_partial_data(temp_cache):
     """Test caching movie with partial data"""
     movie = MatchedMovie(
@@ -191,8 +509,6 @@ def test_partial_data(temp_cache):
     assert cached.genres is None
 
 
-if __name__ == "__main__":
-    print("Running cache tests...\n")
 if __name__ == "__main__":
     import sys
     verbose = "--verbose" in sys.argv or "-v" in sys.argv
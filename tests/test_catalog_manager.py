@@ -1,14 +1,136 @@
 #!/usr/bin/env python3
 """Test CatalogManager sync workflow with limited movies"""
 
+import pytest
 import asyncio
 import sys
 sys.path.insert(0, '.')
 
+import tempfile
+import time
+from types import SimpleNamespace
+
 from src.catalog.manager import CatalogManager
+from src.catalog.scheduler import CatalogScheduler
 from src.cache import MovieCache
+from src.matcher import MatchedMovie
+from src.event_loop import run
+
+
+class StubLetterboxdClient:
+    """Offline Letterboxd client that tracks concurrent lookups"""
+    
+    def __init__(self, known_titles, delay=0.05):
+        self.known_titles = set(known_titles)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    def get_movie_by_title(self, title):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        self.in_flight -= 1
+        if title not in self.known_titles:
+            return None
+        slug = title.lower().replace(' ', '-')
+        return SimpleNamespace(
+            imdb_link="http://www.imdb.com/title/tt0000001/maindetails",
+            rating=4.0,
+            url=f"https://letterboxd.com/film/{slug}/",
+            genres=[{'name': 'Drama'}]
+        )
+
 
+class StubScraper:
+    """Offline scraper returning a fixed catalog"""
+    
+    def __init__(self, titles, complete=True):
+        self.titles = titles
+        self.complete = complete
+        self.calls = []
+        self.last_scrape_complete = False
+    
+    async def scrape_catalog(self, use_cache=True):
+        self.calls.append(use_cache)
+        self.last_scrape_complete = self.complete
+        return self.titles
+
+
+def test_process_new_titles_concurrent():
+    """Test new titles are matched concurrently within the limit"""
+    titles = [{'title': f"Movie {i}", 'year': 2000 + i} for i in range(8)]
+    stub = StubLetterboxdClient(known_titles=[t['title'] for t in titles[:6]])
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = CatalogManager(
+            cache=MovieCache(f"{tmpdir}/catalog.db"),
+            letterboxd_client=stub,
+            log_dir=tmpdir,
+            letterboxd_concurrency=4,
+            letterboxd_interval=0
+        )
+        matched, missing = asyncio.run(manager._process_new_titles(titles))
+    
+    assert sorted(m.title for m in matched) == [f"Movie {i}" for i in range(6)]
+    assert sorted(m['title'] for m in missing) == ["Movie 6", "Movie 7"]
+    assert 1 < stub.max_in_flight <= 4
 
+
+def test_manual_sync_rescrapes():
+    """Test a manual sync bypasses the saved catalog and marks Netflix synced"""
+    scraper = StubScraper([{'title': "Movie 0", 'year': 2000}])
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = MovieCache(f"{tmpdir}/catalog.db")
+        manager = CatalogManager(
+            cache=cache,
+            scraper=scraper,
+            letterboxd_client=StubLetterboxdClient(known_titles=["Movie 0"], delay=0),
+            log_dir=tmpdir,
+            letterboxd_interval=0
+        )
+        stats = asyncio.run(CatalogScheduler(manager).run_sync_now())
+        synced = cache.has_platform_catalog("Netflix")
+        cache.close()
+    
+    assert scraper.calls == [False]
+    assert stats['matched'] == 1
+    assert synced
+
+
+@pytest.mark.parametrize("scraper", [
+    StubScraper([]),
+    StubScraper([{'title': "Movie 0", 'year': 2000}], complete=False),
+], ids=["empty", "incomplete"])
+def test_failed_scrape_keeps_catalog(scraper):
+    """Test an empty or partial scrape neither removes titles nor marks Netflix synced"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = MovieCache(f"{tmpdir}/catalog.db")
+        cache.set_many([
+            MatchedMovie(title=f"Movie {i}", year=2000 + i, streaming_platforms=["Netflix"])
+            for i in range(3)
+        ])
+        manager = CatalogManager(
+            cache=cache,
+            scraper=scraper,
+            letterboxd_client=StubLetterboxdClient(known_titles=[], delay=0),
+            log_dir=tmpdir,
+            letterboxd_interval=0
+        )
+        stats = asyncio.run(manager.sync_netflix_catalog())
+        titles = sorted(m['title'] for m in cache.get_platform_catalog("Netflix"))
+        synced = cache.has_platform_catalog("Netflix")
+        cache.close()
+    
+    assert titles == ["Movie 0", "Movie 1", "Movie 2"]
+    assert not synced
+    assert stats['removed'] == 0
+    assert not stats['complete']
+
+
+@pytest.mark.network
+@pytest.mark.slow
 async def test_catalog_manager():
     """Test catalog manager with a small sync"""
     print("Testing CatalogManager sync workflow")
@@ -21,30 +143,24 @@ async def test_catalog_manager():
     print("\n1. Testing initial sync (first 3 pages)...")
     print("-" * 60)
     
-    # Mock a small scrape for testing
+    # Scrape a small slice of the catalog for testing: the first 3 pages,
+    # fetched concurrently through the scraper's own rate limiter
     from src.scrapers.justwatch_netflix import NetflixScraper
-    import httpx
-    from bs4 import BeautifulSoup
-    import re
-    
-    scraper = NetflixScraper()
-    test_movies = []
-    
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-        for page in range(1, 4):  # Only 3 pages for testing
-            url = f"{scraper.base_url}?page={page}"
-            print(f"Scraping page {page}...")
-            
-            response = await client.get(url, headers=scraper.headers)
-            soup = BeautifulSoup(response.text, 'lxml')
-            movie_links = soup.find_all('a', href=re.compile(r'/movie/'))
-            
-            for link in movie_links:
-                movie = scraper._extract_movie_data_from_link(link)
-                if movie:
-                    test_movies.append(movie)
-            
-            await asyncio.sleep(2)
+    
+    scraper = NetflixScraper(page_concurrency=2)
+    pages = range(1, 4)
+    print(f"Scraping pages {pages.start}-{pages.stop - 1}...")
+    
+    async with scraper:
+        semaphore = asyncio.Semaphore(scraper.page_concurrency)
+        
+        async def fetch(page):
+            async with semaphore:
+                return await scraper._fetch_page(scraper._client, page)
+        
+        results = await asyncio.gather(*(fetch(page) for page in pages))
+    
+    test_movies = [movie for page_movies in results if page_movies for movie in page_movies]
     
     print(f"\nScraped {len(test_movies)} test movies")
     
@@ -96,7 +212,7 @@ async def test_catalog_manager():
 
 if __name__ == "__main__":
     try:
-        result = asyncio.run(test_catalog_manager())
+        result = run(test_catalog_manager())
         print(f"\nTest summary: {result}")
     except KeyboardInterrupt:
         print("\n\n⚠️ Test interrupted by user")
@@ -5,84 +5,94 @@ Tests the simple-justwatch-python-api library to see how many Netflix titles
 can be retrieved using different query approaches.
 """
 
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from simplejustwatchapi.justwatch import search
 import logging
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
+NETFLIX = "netflix"
+
+
+def _on_netflix(movie):
+    """Check whether any of a movie's offers is a Netflix package"""
+    offers = getattr(movie, 'offers', None)
+    return bool(offers) and any(NETFLIX in offer.package.name.casefold() for offer in offers)
+
+
+@pytest.mark.network
 def test_search_approaches():
     """Test different search approaches to find Netflix movies"""
     
-    print("\n=== Testing JustWatch API for Netflix Catalog ===\n")
+    logger.info("=== Testing JustWatch API for Netflix Catalog ===")
     
     # Test 1: Empty search
-    print("Test 1: Empty string search")
+    logger.info("Test 1: Empty string search")
     try:
         results = search("", country="US", language="en", count=50)
-        print(f"  Results: {len(results)} movies")
+        logger.info("  Results: %d movies", len(results))
         if results:
-            print(f"  Sample: {results[0].title}")
+            logger.info("  Sample: %s", results[0].title)
     except Exception as e:
-        print(f"  Error: {e}")
+        logger.warning("  Error: %s", e)
     
     # Test 2: Common word search
-    print("\nTest 2: Generic word 'the'")
+    logger.info("Test 2: Generic word 'the'")
     try:
         results = search("the", country="US", language="en", count=50)
-        print(f"  Results: {len(results)} movies")
+        logger.info("  Results: %d movies", len(results))
         if results:
-            print(f"  Sample: {results[0].title}")
+            logger.info("  Sample: %s", results[0].title)
     except Exception as e:
-        print(f"  Error: {e}")
+        logger.warning("  Error: %s", e)
     
     # Test 3: Check maximum count parameter
-    print("\nTest 3: Maximum count (100)")
+    logger.info("Test 3: Maximum count (100)")
     try:
         results = search("", country="US", language="en", count=100)
-        print(f"  Results: {len(results)} movies")
+        logger.info("  Results: %d movies", len(results))
     except Exception as e:
-        print(f"  Error: {e}")
+        logger.warning("  Error: %s", e)
     
     # Test 4: Filter by provider using offers
-    print("\nTest 4: Filter results by Netflix provider")
+    logger.info("Test 4: Filter results by Netflix provider")
     try:
         all_results = search("", country="US", language="en", count=50)
-        netflix_results = []
-        for movie in all_results:
-            if hasattr(movie, 'offers') and movie.offers:
-                for offer in movie.offers:
-                    if 'netflix' in offer.package.name.lower():
-                        netflix_results.append(movie)
-                        break
-        print(f"  Total results: {len(all_results)}")
-        print(f"  Netflix results: {len(netflix_results)}")
+        netflix_results = [movie for movie in all_results if _on_netflix(movie)]
+        logger.info("  Total results: %d", len(all_results))
+        logger.info("  Netflix results: %d", len(netflix_results))
         if netflix_results:
-            print(f"  Sample Netflix movie: {netflix_results[0].title}")
+            logger.info("  Sample Netflix movie: %s", netflix_results[0].title)
     except Exception as e:
-        print(f"  Error: {e}")
+        logger.warning("  Error: %s", e)
     
     # Test 5: Multiple searches with different queries
-    print("\nTest 5: Aggregate results from multiple searches")
+    logger.info("Test 5: Aggregate results from multiple searches")
     queries = ["the", "a", "love", "life", "night", "day", "man", "woman"]
-    all_movies = {}
     try:
-        for query in queries:
-            results = search(query, country="US", language="en", count=50)
-            for movie in results:
-                if hasattr(movie, 'offers') and movie.offers:
-                    for offer in movie.offers:
-                        if 'netflix' in offer.package.name.lower():
-                            if hasattr(movie, 'imdb_id') and movie.imdb_id:
-                                all_movies[movie.imdb_id] = movie
-                            break
+        # Independent network-bound searches, so overlap them in threads
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            batches = list(executor.map(
+                lambda query: search(query, country="US", language="en", count=50),
+                queries
+            ))
+        all_movies = {
+            movie.imdb_id: movie
+            for results in batches
+            for movie in results
+            if getattr(movie, 'imdb_id', None) and _on_netflix(movie)
+        }
         
-        print(f"  Unique Netflix movies found: {len(all_movies)}")
-        print(f"  Sample titles:")
-        for i, movie in enumerate(list(all_movies.values())[:5]):
-            print(f"    - {movie.title}")
+        logger.info("  Unique Netflix movies found: %d", len(all_movies))
+        logger.info("  Sample titles:")
+        for movie in list(all_movies.values())[:5]:
+            logger.info("    - %s", movie.title)
     except Exception as e:
-        print(f"  Error: {e}")
+        logger.warning("  Error: %s", e)
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_search_approaches()
     print("\n=== Test Complete ===\n")
@@ -2,6 +2,7 @@
 """Test suite for JustWatch client wrapper"""
 
 import pytest
+from types import SimpleNamespace
 from src.justwatch.client import JustWatchClient
 
 
@@ -18,71 +19,75 @@ def test_client_initialization():
     assert client_uk.language == "en"
 
 
-def test_search_movies():
+@pytest.mark.network
+def test_search_movies(jw_client):
     """Test basic movie search functionality"""
-    client = JustWatchClient()
-    results = client.search_movies("Inception", count=3)
+    results = jw_client.search_movies("Inception", count=3)
     
     assert len(results) > 0
     assert results[0].title == "Inception"
     assert hasattr(results[0], 'entry_id')
 
 
-def test_get_movie_details():
+@pytest.mark.network
+def test_get_movie_details(jw_client, inception_jw):
     """Test fetching detailed movie information"""
-    client = JustWatchClient()
-    
-    # First search for movie to get entry_id
-    results = client.search_movies("Inception", count=1)
-    assert len(results) > 0
-    
-    entry_id = results[0].entry_id
-    details = client.get_movie_details(entry_id)
+    details = jw_client.get_movie_details(inception_jw.entry_id)
     
     assert details.title == "Inception"
     assert hasattr(details, 'entry_id')
 
 
-def test_search_by_platform():
+@pytest.mark.network
+def test_search_by_platform(jw_client):
     """Test searching for movies on specific platform"""
-    client = JustWatchClient()
-    results = client.search_by_platform("Stranger Things", "Netflix", count=5)
+    results = jw_client.search_by_platform("Stranger Things", "Netflix", count=5)
     
     # Should find at least the main result
     assert len(results) > 0
     
     # Verify Netflix is in offers
-    found_netflix = False
-    for result in results:
-        if result.offers:
-            for offer in result.offers:
-                if 'netflix' in offer.package.name.lower():
-                    found_netflix = True
-                    break
+    found_netflix = any(
+        "netflix" in offer.package.name.casefold()
+        for result in results
+        for offer in result.offers or ()
+    )
     
     assert found_netflix, "Netflix not found in search results"
 
 
-def test_get_streaming_platforms():
-    """Test extracting streaming platforms from movie"""
+def test_search_by_platform_streaming_only(monkeypatch):
+    """Test streaming_only skips rent/buy offers for the platform"""
+    def offer(name, monetization_type):
+        return SimpleNamespace(package=SimpleNamespace(name=name), monetization_type=monetization_type)
+    
+    streaming = SimpleNamespace(title="Streaming", offers=[offer("Netflix", "FLATRATE")])
+    rental = SimpleNamespace(title="Rental", offers=[offer("Netflix", "RENT"), offer("Hulu", "FLATRATE")])
+    
     client = JustWatchClient()
-    results = client.search_movies("Stranger Things", count=1)
+    monkeypatch.setattr(client, "search_movies", lambda *args, **kwargs: [streaming, rental])
+    
+    assert client.search_by_platform("", "netflix") == [streaming, rental]
+    assert client.search_by_platform("", "netflix", streaming_only=True) == [streaming]
+
+
+@pytest.mark.network
+def test_get_streaming_platforms(jw_client):
+    """Test extracting streaming platforms from movie"""
+    results = jw_client.search_movies("Stranger Things", count=1)
     
     assert len(results) > 0
-    platforms = client.get_streaming_platforms(results[0])
+    platforms = jw_client.get_streaming_platforms(results[0])
     
     # Should return list of platform names
     assert isinstance(platforms, list)
     assert "Netflix" in platforms
 
 
-def test_extract_imdb_id():
+@pytest.mark.network
+def test_extract_imdb_id(jw_client, inception_jw):
     """Test IMDb ID extraction"""
-    client = JustWatchClient()
-    results = client.search_movies("Inception", count=1)
-    
-    assert len(results) > 0
-    imdb_id = client.extract_imdb_id(results[0])
+    imdb_id = jw_client.extract_imdb_id(inception_jw)
     
     # Inception has IMDb ID
     assert imdb_id is not None
@@ -95,66 +100,60 @@ if __name__ == "__main__":
     
     print("Running JustWatch client tests...\n")
     
+    jw_client = JustWatchClient()
+    inception_jw = jw_client.search_movies("Inception", count=1)[0]
+    
     test_client_initialization()
     print("✓ Client initialization test passed")
     
     if verbose:
         print("\nTest: search_movies")
-        client = JustWatchClient()
-        results = client.search_movies("Inception", count=3)
+        results = jw_client.search_movies("Inception", count=3)
         print(f"  Found {len(results)} results")
         for i, movie in enumerate(results[:2]):
             print(f"  [{i+1}] {movie.title} ({movie.entry_id})")
     
-    test_search_movies()
+    test_search_movies(jw_client)
     print("✓ Search movies test passed")
     
     if verbose:
         print("\nTest: get_movie_details")
-        client = JustWatchClient()
-        results = client.search_movies("Inception", count=1)
-        if results:
-            details = client.get_movie_details(results[0].entry_id)
-            print(f"  Title: {details.title}")
-            print(f"  Entry ID: {details.entry_id}")
-            if details.offers:
-                print(f"  Offers: {len(details.offers)} platforms")
+        details = jw_client.get_movie_details(inception_jw.entry_id)
+        print(f"  Title: {details.title}")
+        print(f"  Entry ID: {details.entry_id}")
+        if details.offers:
+            print(f"  Offers: {len(details.offers)} platforms")
     
-    test_get_movie_details()
+    test_get_movie_details(jw_client, inception_jw)
     print("✓ Get movie details test passed")
     
     if verbose:
         print("\nTest: search_by_platform")
-        client = JustWatchClient()
-        results = client.search_by_platform("Stranger Things", "Netflix", count=3)
+        results = jw_client.search_by_platform("Stranger Things", "Netflix", count=3)
         print(f"  Found {len(results)} Netflix results")
         for movie in results[:2]:
-            platforms = client.get_streaming_platforms(movie)
+            platforms = jw_client.get_streaming_platforms(movie)
             print(f"  - {movie.title}: {platforms}")
     
-    test_search_by_platform()
+    test_search_by_platform(jw_client)
     print("✓ Search by platform test passed")
     
     if verbose:
         print("\nTest: get_streaming_platforms")
-        client = JustWatchClient()
-        results = client.search_movies("Stranger Things", count=1)
+        results = jw_client.search_movies("Stranger Things", count=1)
         if results:
-            platforms = client.get_streaming_platforms(results[0])
+            platforms = jw_client.get_streaming_platforms(results[0])
             print(f"  {results[0].title} available on: {platforms}")
     
-    test_get_streaming_platforms()
+    test_get_streaming_platforms(jw_client)
     print("✓ Get streaming platforms test passed")
     
     if verbose:
         print("\nTest: extract_imdb_id")
-        client = JustWatchClient()
-        results = client.search_movies("Inception", count=1)
-        if results:
-            imdb_id = client.extract_imdb_id(results[0])
-            print(f"  {results[0].title} IMDb ID: {imdb_id}")
+        imdb_id = jw_client.extract_imdb_id(inception_jw)
+        print(f"  {inception_jw.title} IMDb ID: {imdb_id}")
     
-    test_extract_imdb_id()
+    test_extract_imdb_id(jw_client, inception_jw)
     print("✓ Extract IMDb ID test passed")
     
     print("\n✓ All tests passed!")
@@ -1,50 +1,42 @@
 #!/usr/bin/env python3
 """Test script for Letterboxd API - lookup movie ratings"""
 
+import pytest
 from letterboxdpy.user import User
 from letterboxdpy.movie import Movie
 
-def test_letterboxd_movie_lookup():
+
+# Slugs looked up live, one test case each
+TEST_MOVIES = [
+    "inception",
+    "the-shawshank-redemption",
+    "pulp-fiction"
+]
+
+
+@pytest.mark.network
+@pytest.mark.parametrize("movie_slug", TEST_MOVIES)
+def test_letterboxd_movie_lookup(movie_slug):
     """Test Letterboxd movie lookup and rating retrieval"""
-    print("=== Testing Letterboxd API ===\n")
+    # Lookup errors propagate so pytest reports them with a full traceback
+    movie = Movie(movie_slug)
+    print(f"\n   Movie: {movie.title}")
+    print(f"   Year: {movie.year}")
+    print(f"   Rating: {movie.rating}/5.0")
+    # Rating count not directly available in letterboxdpy
+    print(f"   URL: {movie.url}")
     
-    test_movies = [
-        "inception",
-        "the-shawshank-redemption",
-        "pulp-fiction"
-    ]
+    if hasattr(movie, 'directors') and movie.directors:
+        print(f"   Director(s): {', '.join(movie.directors)}")
     
-    print("1. Looking up movie ratings on Letterboxd...")
-    successful_lookups = 0
-    
-    for movie_slug in test_movies:
-        try:
-            movie = Movie(movie_slug)
-            print(f"\n   Movie: {movie.title}")
-            print(f"   Year: {movie.year}")
-            print(f"   Rating: {movie.rating}/5.0")
-            # Rating count not directly available in letterboxdpy
-            print(f"   URL: {movie.url}")
-            
-            if hasattr(movie, 'directors') and movie.directors:
-                print(f"   Director(s): {', '.join(movie.directors)}")
-            
-            if hasattr(movie, 'genres') and movie.genres:
-                genre_names = [g['name'] if isinstance(g, dict) else str(g) for g in movie.genres[:3]]
-                print(f"   Genres: {', '.join(genre_names)}")
-            
-            successful_lookups += 1
-            print(f"   ✓ Successfully retrieved data")
-            
-        except Exception as e:
-            print(f"\n   ✗ Error looking up '{movie_slug}': {e}")
-            import traceback
-            traceback.print_exc()
+    if hasattr(movie, 'genres') and movie.genres:
+        genre_names = [g['name'] if isinstance(g, dict) else str(g) for g in movie.genres[:3]]
+        print(f"   Genres: {', '.join(genre_names)}")
     
-    print(f"\n✓ Successfully looked up {successful_lookups}/{len(test_movies)} movies")
-    return successful_lookups > 0
+    print(f"   ✓ Successfully retrieved data")
 
 
+@pytest.mark.network
 def test_letterboxd_user_data():
     """Test Letterboxd user data retrieval (optional)"""
     print("\n2. Testing user data retrieval...")
@@ -70,7 +62,17 @@ if __name__ == "__main__":
     print("Testing Letterboxd API integration\n")
     print("=" * 50)
     
-    movie_success = test_letterboxd_movie_lookup()
+    print("=== Testing Letterboxd API ===\n")
+    print("1. Looking up movie ratings on Letterboxd...")
+    successful_lookups = 0
+    for movie_slug in TEST_MOVIES:
+        try:
+            test_letterboxd_movie_lookup(movie_slug)
+            successful_lookups += 1
+        except Exception as e:
+            print(f"\n   ✗ Error looking up '{movie_slug}': {e}")
+    print(f"\n✓ Successfully looked up {successful_lookups}/{len(TEST_MOVIES)} movies")
+    movie_success = successful_lookups > 0
     
     if movie_success:
         test_letterboxd_user_data()
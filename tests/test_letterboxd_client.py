@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
 """Test suite for Letterboxd client wrapper"""
 
+import gc
 import pytest
+import os
+import re
+import httpx
+import tempfile
+import weakref
+from types import SimpleNamespace
+from src.letterboxd import client as client_module
+from src.letterboxd.cache import LetterboxdCache
 from src.letterboxd.client import LetterboxdClient
 
 
@@ -11,181 +20,307 @@ def test_client_initialization():
     assert client is not None
 
 
-def test_get_movie():
+@pytest.mark.network
+def test_get_movie(lb_client):
     """Test fetching movie by slug"""
-    client = LetterboxdClient()
-    movie = client.get_movie("inception")
+    movie = lb_client.get_movie("inception")
     
     assert movie is not None
     assert movie.title == "Inception"
     assert hasattr(movie, 'rating')
 
 
-def test_get_movie_by_title():
-    """Test fetching movie by title (converts to slug)"""
-    client = LetterboxdClient()
+def test_close_releases_cache():
+    """Test a closed Letterboxd cache isn't kept alive by its exit hook"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = LetterboxdCache(os.path.join(tmpdir, "letterboxd.db"))
+        ref = weakref.ref(cache)
+        cache.close()
+        del cache
+        gc.collect()
+        assert ref() is None
+
+
+def test_get_movie_cached(monkeypatch):
+    """Test repeat lookups are served from the persistent cache"""
+    fetched = []
+    
+    def fake_movie(slug):
+        fetched.append(slug)
+        return SimpleNamespace(
+            slug=slug,
+            title="Inception",
+            year=2010,
+            url=f"https://letterboxd.com/film/{slug}/",
+            rating=4.22,
+            genres=[{'name': 'Action'}],
+            imdb_link="http://www.imdb.com/title/tt1375666/maindetails"
+        )
+    
+    monkeypatch.setattr(client_module, "Movie", fake_movie)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = LetterboxdCache(os.path.join(tmpdir, "letterboxd.db"))
+        client = LetterboxdClient(cache=cache)
+        
+        first = client.get_movie("inception")
+        
+        # A fresh client over the same file hits the cache
+        cached = LetterboxdClient(cache=cache).get_movie("inception")
+        assert fetched == ["inception"]
+        assert cached.rating == first.rating
+        assert cached.url == first.url
+        assert client.get_genres(cached) == ["Action"]
+        assert client.extract_imdb_id(cached) == "tt1375666"
+        
+        # Expired entries are fetched again
+        cache.ttl_hours = 0
+        client.get_movie("inception")
+        assert fetched == ["inception", "inception"]
+        
+        cache.close()
+
+
+def test_get_genres_shapes():
+    """Test genre extraction from dict, string and malformed lists"""
+    client = LetterboxdClient(use_cache=False)
+    
+    assert client.get_genres(SimpleNamespace(genres=[{'name': "Action"}, {'name': "Drama"}])) == ["Action", "Drama"]
+    assert client.get_genres(SimpleNamespace(genres=[{'name': "Action"}, "Drama"])) == ["Action", "Drama"]
+    assert client.get_genres(SimpleNamespace(genres=[{'type': "genre"}])) == []
+    assert client.get_genres(SimpleNamespace(genres=None)) == []
+    assert client.get_genres(None) == []
+
+
+def test_extract_imdb_id_memoized():
+    """Test IMDb ID parsing handles link shapes and memoizes per movie"""
+    client = LetterboxdClient(use_cache=False)
+    
+    movie = SimpleNamespace(imdb_link="http://www.imdb.com/title/tt1375666/maindetails")
+    assert client.extract_imdb_id(movie) == "tt1375666"
     
+    # Memoized value wins over later changes to the link
+    movie.imdb_link = "https://www.imdb.com/title/tt0133093/"
+    assert client.extract_imdb_id(movie) == "tt1375666"
+    
+    assert client.extract_imdb_id(SimpleNamespace(imdb_link="https://www.imdb.com/name/tt123/")) is None
+    assert client.extract_imdb_id(SimpleNamespace(imdb_link=None)) is None
+    assert client.extract_imdb_id(SimpleNamespace()) is None
+    assert client.extract_imdb_id(None) is None
+
+
+@pytest.mark.network
+def test_get_movie_by_title(lb_client):
+    """Test fetching movie by title (converts to slug)"""
     # Test with simple title
-    movie = client.get_movie_by_title("Inception")
+    movie = lb_client.get_movie_by_title("Inception")
     assert movie is not None
     assert movie.title == "Inception"
     
     # Test with title requiring conversion
-    movie2 = client.get_movie_by_title("The Matrix")
+    movie2 = lb_client.get_movie_by_title("The Matrix")
     assert movie2 is not None
 
 
-def test_get_rating():
+@pytest.mark.network
+def test_get_rating(lb_client, inception_lb):
     """Test extracting rating from movie"""
-    client = LetterboxdClient()
-    movie = client.get_movie("inception")
-    
-    rating = client.get_rating(movie)
+    rating = lb_client.get_rating(inception_lb)
     assert rating is not None
     assert isinstance(rating, float)
     assert 0 <= rating <= 5.0
 
 
-def test_get_genres():
+@pytest.mark.network
+def test_get_genres(lb_client, inception_lb):
     """Test extracting genres from movie"""
-    client = LetterboxdClient()
-    movie = client.get_movie("inception")
-    
-    genres = client.get_genres(movie)
+    genres = lb_client.get_genres(inception_lb)
     assert isinstance(genres, list)
     assert len(genres) > 0
     # Inception should have Action or Sci-Fi
     assert any(g in genres for g in ["Action", "Science Fiction", "Thriller"])
 
 
-def test_extract_imdb_id():
+@pytest.mark.network
+def test_extract_imdb_id(lb_client, inception_lb):
     """Test extracting IMDb ID from movie"""
-    client = LetterboxdClient()
-    movie = client.get_movie("inception")
-    
-    imdb_id = client.extract_imdb_id(movie)
+    imdb_id = lb_client.extract_imdb_id(inception_lb)
     assert imdb_id is not None
     assert imdb_id.startswith("tt")
     # Inception's IMDb ID
     assert imdb_id == "tt1375666"
 
 
-def test_get_user():
+@pytest.mark.network
+def test_get_user(lb_client):
     """Test fetching user profile"""
-    client = LetterboxdClient()
-    user = client.get_user("jack")
+    user = lb_client.get_user("jack")
     
     assert user is not None
     assert user.username == "jack"
     assert hasattr(user, 'display_name')
 
 
-def test_title_to_slug():
+SLUG_CASES = [
+    # Simple title
+    ("Inception", "inception"),
+    # Title with spaces
+    ("The Matrix", "the-matrix"),
+    # Title with special characters
+    ("Spider-Man: Homecoming", "spider-man-homecoming"),
+    # Title with multiple spaces
+    ("The Lord  of the Rings", "the-lord-of-the-rings"),
+    # Apostrophes are dropped without a hyphen
+    ("Schindler's List", "schindlers-list"),
+    (" Mission: Impossible - Fallout ", "mission-impossible-fallout"),
+    # Accents are folded; other non-ASCII letters are kept
+    ("Amélie", "amelie"),
+    ("Pokémon: Detective Pikachu", "pokemon-detective-pikachu"),
+    ("Ædnan", "aednan"),
+    ("千と千尋", "千と千尋"),
+]
+
+
+@pytest.mark.parametrize("title,slug", SLUG_CASES)
+def test_title_to_slug(title, slug):
     """Test title to slug conversion"""
-    client = LetterboxdClient()
+    assert LetterboxdClient._title_to_slug(title) == slug
+
+
+def test_title_to_slug_precompiled(monkeypatch):
+    """Test slug conversion never compiles a regex per call"""
+    compiled = []
+    real_compile = re._compile
     
-    # Simple title
-    assert client._title_to_slug("Inception") == "inception"
+    def counting_compile(*args, **kwargs):
+        compiled.append(args[0])
+        return real_compile(*args, **kwargs)
     
-    # Title with spaces
-    assert client._title_to_slug("The Matrix") == "the-matrix"
+    monkeypatch.setattr(re, "_compile", counting_compile)
+    for title, _ in SLUG_CASES:
+        LetterboxdClient._title_to_slug(title)
     
-    # Title with special characters
-    assert client._title_to_slug("Spider-Man: Homecoming") == "spider-man-homecoming"
+    assert compiled == []
+
+
+def test_get_movie_by_imdb(monkeypatch):
+    """Test IMDb lookups follow Letterboxd's redirect and cache the slug"""
+    requested = []
     
-    # Title with multiple spaces
-    assert client._title_to_slug("The Lord  of the Rings") == "the-lord-of-the-rings"
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path == "/imdb/tt1375666/":
+            return httpx.Response(302, headers={'Location': "https://letterboxd.com/film/inception/"})
+        return httpx.Response(404)
+    
+    monkeypatch.setattr(client_module, "Movie", lambda slug: SimpleNamespace(slug=slug, title="Inception"))
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = LetterboxdCache(os.path.join(tmpdir, "letterboxd.db"))
+        client = LetterboxdClient(cache=cache)
+        client._http = httpx.Client(transport=httpx.MockTransport(handler))
+        
+        assert client.get_movie_by_imdb("tt1375666").slug == "inception"
+        assert client.get_movie_by_imdb("tt0000000") is None
+        assert cache.get_slug("tt1375666") == "inception"
+        
+        # Known IDs resolve without another request
+        requested.clear()
+        assert client.get_slug_by_imdb("tt1375666") == "inception"
+        assert requested == []
+        
+        cache.close()
 
 
-def test_error_handling():
-    """Test error handling for invalid movie"""
-    client = LetterboxdClient()
+def test_fetch_error_logged(monkeypatch, caplog):
+    """Test fetch failures are logged as warnings instead of printed"""
+    def failing_movie(slug):
+        raise ValueError("404")
+    
+    monkeypatch.setattr(client_module, "Movie", failing_movie)
+    client = LetterboxdClient(use_cache=False)
+    
+    with caplog.at_level("WARNING", logger=client_module.__name__):
+        assert client.get_movie("no-such-film") is None
     
+    assert caplog.messages == ["Error fetching movie 'no-such-film': 404"]
+
+
+@pytest.mark.network
+def test_error_handling(lb_client):
+    """Test error handling for invalid movie"""
     # Non-existent movie
-    movie = client.get_movie("this-movie-definitely-does-not-exist-12345")
+    movie = lb_client.get_movie("this-movie-definitely-does-not-exist-12345")
     assert movie is None
 
 
-if __name__ == "__main__":
-    print("Running Letterboxd client tests...\n")
-    
-    test_client_initialization()
-    print("✓ Client initialization test passed")
-    
-    test_get_movie()
 if __name__ == "__main__":
     import sys
     verbose = "--verbose" in sys.argv or "-v" in sys.argv
     
     print("Running Letterboxd client tests...\n")
     
+    lb_client = LetterboxdClient()
+    inception_lb = lb_client.get_movie("inception")
+    
     test_client_initialization()
     print("✓ Client initialization test passed")
     
     if verbose:
         print("\nTest: get_movie")
-        client = LetterboxdClient()
-        movie = client.get_movie("inception")
-        print(f"  Title: {movie.title}")
-        print(f"  Year: {movie.year}")
-        print(f"  Rating: {movie.rating}/5.0")
+        print(f"  Title: {inception_lb.title}")
+        print(f"  Year: {inception_lb.year}")
+        print(f"  Rating: {inception_lb.rating}/5.0")
     
-    test_get_movie()
+    test_get_movie(lb_client)
     print("✓ Get movie test passed")
     
     if verbose:
         print("\nTest: get_movie_by_title")
-        client = LetterboxdClient()
-        movie = client.get_movie_by_title("The Matrix")
+        movie = lb_client.get_movie_by_title("The Matrix")
         print(f"  Found: {movie.title} ({movie.year})")
     
-    test_get_movie_by_title()
+    test_get_movie_by_title(lb_client)
     print("✓ Get movie by title test passed")
     
     if verbose:
         print("\nTest: get_rating")
-        client = LetterboxdClient()
-        movie = client.get_movie("inception")
-        rating = client.get_rating(movie)
-        print(f"  {movie.title}: {rating}/5.0")
+        rating = lb_client.get_rating(inception_lb)
+        print(f"  {inception_lb.title}: {rating}/5.0")
     
-    test_get_rating()
+    test_get_rating(lb_client, inception_lb)
     print("✓ Get rating test passed")
     
     if verbose:
         print("\nTest: get_genres")
-        client = LetterboxdClient()
-        movie = client.get_movie("inception")
-        genres = client.get_genres(movie)
-        print(f"  {movie.title} genres: {genres}")
+        genres = lb_client.get_genres(inception_lb)
+        print(f"  {inception_lb.title} genres: {genres}")
     
-    test_get_genres()
+    test_get_genres(lb_client, inception_lb)
     print("✓ Get genres test passed")
     
     if verbose:
         print("\nTest: extract_imdb_id")
-        client = LetterboxdClient()
-        movie = client.get_movie("inception")
-        imdb_id = client.extract_imdb_id(movie)
-        print(f"  {movie.title} IMDb ID: {imdb_id}")
+        imdb_id = lb_client.extract_imdb_id(inception_lb)
+        print(f"  {inception_lb.title} IMDb ID: {imdb_id}")
     
-    test_extract_imdb_id()
+    test_extract_imdb_id(lb_client, inception_lb)
     print("✓ Extract IMDb ID test passed")
     
     if verbose:
         print("\nTest: get_user")
-        client = LetterboxdClient()
-        user = client.get_user("jack")
+        user = lb_client.get_user("jack")
         print(f"  Username: {user.username}")
         print(f"  Display name: {user.display_name}")
     
-    test_get_user()
+    test_get_user(lb_client)
     print("✓ Get user test passed")
     
-    test_title_to_slug()
+    for title, slug in SLUG_CASES:
+        test_title_to_slug(title, slug)
     print("✓ Title to slug conversion test passed")
     
-    test_error_handling()
+    test_error_handling(lb_client)
     print("✓ Error handling test passed")
     
     print("\n✓ All tests passed!")
@@ -2,7 +2,13 @@
 """Test suite for movie matching logic"""
 
 import pytest
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
 from src.matcher import MovieMatcher, MatchedMovie
+from src.letterboxd.cache import CachedMovie, LetterboxdCache
 from src.justwatch.client import JustWatchClient
 from src.letterboxd.client import LetterboxdClient
 
@@ -21,17 +27,11 @@ def test_matcher_initialization():
     assert matcher2.letterboxd is lb_client
 
 
-def test_match_by_imdb_id():
+@pytest.mark.network
+def test_match_by_imdb_id(matcher, inception_jw):
     """Test matching movie using JustWatch data"""
-    matcher = MovieMatcher()
-    jw_client = JustWatchClient()
-    
-    # Search for Inception
-    results = jw_client.search_movies("Inception", count=1)
-    assert len(results) > 0
-    
-    # Match with Letterboxd
-    matched = matcher.match_by_imdb_id(results[0])
+    # Match Inception's JustWatch entry with Letterboxd
+    matched = matcher.match_by_imdb_id(inception_jw)
     
     assert matched is not None
     assert matched.title == "Inception"
@@ -41,22 +41,28 @@ def test_match_by_imdb_id():
     assert matched.letterboxd_rating > 0
 
 
-def test_match_by_title():
+# Properties of Inception's title match; genres and platforms depend on
+# the Letterboxd match and current offers, so they may be missing
+INCEPTION_CHECKS = [
+    ("title", lambda value: "Inception" in value),
+    ("imdb_id", lambda value: value is not None and value.startswith("tt")),
+    ("letterboxd_rating", lambda value: value is not None),
+    ("genres", lambda value: not value or isinstance(value, list)),
+    ("streaming_platforms", lambda value: not value or isinstance(value, list)),
+]
+
+
+@pytest.mark.network
+@pytest.mark.parametrize("attr,check", INCEPTION_CHECKS, ids=[attr for attr, _ in INCEPTION_CHECKS])
+def test_match_by_title(inception_matched, attr, check):
     """Test matching movie by title"""
-    matcher = MovieMatcher()
-    
-    matched = matcher.match_by_title("Inception")
-    
-    assert matched is not None
-    assert "Inception" in matched.title
-    assert matched.imdb_id is not None
-    assert matched.letterboxd_rating is not None
+    assert inception_matched is not None
+    assert check(getattr(inception_matched, attr))
 
 
-def test_match_platform_movies():
+@pytest.mark.network
+def test_match_platform_movies(matcher):
     """Test matching movies from specific platform"""
-    matcher = MovieMatcher()
-    
     # Get Netflix movies (limit to 3 for speed)
     matched_movies = matcher.match_platform_movies("Netflix", count=3)
     
@@ -69,6 +75,93 @@ def test_match_platform_movies():
         assert movie.imdb_id is not None
 
 
+def test_match_platform_movies_async(matcher, monkeypatch):
+    """Test concurrent platform matching keeps order and drops misses"""
+    titles = [f"Movie {i}" for i in range(6)]
+    monkeypatch.setattr(matcher.justwatch, "search_by_platform", lambda *args, **kwargs: titles)
+    
+    def slow_match(title):
+        time.sleep(0.2)
+        return None if title == "Movie 3" else MatchedMovie(title=title)
+    
+    monkeypatch.setattr(matcher, "match_by_imdb_id", slow_match)
+    
+    start = time.monotonic()
+    movies = asyncio.run(matcher.match_platform_movies_async("Netflix", count=6, concurrency=6))
+    elapsed = time.monotonic() - start
+    
+    assert [m.title for m in movies] == [t for t in titles if t != "Movie 3"]
+    # Serial matching would take 6 x 0.2s
+    assert elapsed < 0.8
+
+
+def test_match_titles_async(matcher, monkeypatch):
+    """Test title lookups overlap and keep input order, including misses"""
+    titles = [f"Movie {i}" for i in range(6)]
+    
+    def slow_match(title):
+        time.sleep(0.2)
+        return None if title == "Movie 3" else MatchedMovie(title=title)
+    
+    monkeypatch.setattr(matcher, "match_by_title", slow_match)
+    
+    start = time.monotonic()
+    movies = asyncio.run(matcher.match_titles_async(titles, concurrency=6))
+    elapsed = time.monotonic() - start
+    
+    assert [m and m.title for m in movies] == [None if t == "Movie 3" else t for t in titles]
+    # Serial matching would take 6 x 0.2s
+    assert elapsed < 0.8
+
+
+def test_match_reuses_known_slug():
+    """Test verified IMDb ID -> slug matches skip the title lookup"""
+    class StubLetterboxd(LetterboxdClient):
+        def __init__(self):
+            super().__init__(use_cache=False)
+            self.calls = []
+        
+        def get_movie(self, slug):
+            self.calls.append(slug)
+            return CachedMovie(
+                slug=slug,
+                url=f"https://letterboxd.com/film/{slug}/",
+                rating=4.2,
+                imdb_link="http://www.imdb.com/title/tt1375666/maindetails"
+            )
+    
+    jw_movie = SimpleNamespace(
+        title="Inception: The IMAX Experience",
+        imdb_id="tt1375666",
+        entry_id="tm92641",
+        offers=[]
+    )
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        slug_cache = LetterboxdCache(os.path.join(tmpdir, "letterboxd.db"))
+        letterboxd = StubLetterboxd()
+        matcher = MovieMatcher(letterboxd_client=letterboxd, slug_cache=slug_cache)
+        
+        # First match guesses the slug from the title and records it
+        matcher.match_by_imdb_id(jw_movie, letterboxd_slug="inception")
+        jw_movie2 = SimpleNamespace(**{**vars(jw_movie), 'title': "Inception (Re-release)"})
+        matched = matcher.match_by_imdb_id(jw_movie2)
+        
+        assert letterboxd.calls == ["inception", "inception"]
+        assert matched.letterboxd_slug == "inception"
+        assert slug_cache.get_slug("tt1375666") == "inception"
+        
+        slug_cache.close()
+
+
+def test_slug_from_url():
+    """Test Letterboxd slug extraction from film URLs"""
+    assert MovieMatcher._slug_from_url("https://letterboxd.com/film/inception/") == "inception"
+    assert MovieMatcher._slug_from_url("https://letterboxd.com/film/the-crack-inception") == "the-crack-inception"
+    assert MovieMatcher._slug_from_url("https://letterboxd.com/") is None
+    assert MovieMatcher._slug_from_url(None) is None
+
+
 def test_matched_movie_dataclass():
     """Test MatchedMovie dataclass"""
     movie = MatchedMovie(
@@ -86,13 +179,36 @@ def test_matched_movie_dataclass():
     assert "Netflix" in movie.streaming_platforms
     assert movie.letterboxd_rating == 4.2
     assert "Action" in movie.genres
+    
+    # Slotted dataclass carries no per-instance __dict__
+    assert not hasattr(movie, "__dict__")
 
 
-def test_partial_match():
-    """Test creating partial match when Letterboxd data unavailable"""
-    matcher = MovieMatcher()
-    jw_client = JustWatchClient()
+def test_matched_movie_from_row():
+    """Test building MatchedMovie from a field-keyed row"""
+    movie = MatchedMovie(
+        title="Test Movie",
+        imdb_id="tt1234567",
+        year=2020,
+        letterboxd_rating=4.2,
+        letterboxd_url="https://letterboxd.com/film/test-movie/"
+    )
+    row = movie.to_dict()
     
+    rebuilt = MatchedMovie.from_row(row, streaming_platforms=["Netflix"], genres=["Drama"])
+    
+    assert rebuilt.title == movie.title
+    assert rebuilt.imdb_id == movie.imdb_id
+    assert rebuilt.year == movie.year
+    assert rebuilt.letterboxd_rating == movie.letterboxd_rating
+    assert rebuilt.letterboxd_url == movie.letterboxd_url
+    assert rebuilt.streaming_platforms == ["Netflix"]
+    assert rebuilt.genres == ["Drama"]
+
+
+@pytest.mark.network
+def test_partial_match(jw_client, matcher):
+    """Test creating partial match when Letterboxd data unavailable"""
     # Search for movie that might not be on Letterboxd
     results = jw_client.search_movies("Stranger Things", count=1)
     
@@ -106,98 +222,69 @@ def test_partial_match():
         assert matched.justwatch_id is not None
 
 
-def test_match_with_genres():
-    """Test that matched movies include genre data"""
-    matcher = MovieMatcher()
-    
-    matched = matcher.match_by_title("Inception")
-    
-    assert matched is not None
-    if matched.genres:  # Genres available if Letterboxd match succeeded
-        assert isinstance(matched.genres, list)
-        assert len(matched.genres) > 0
-
-
-def test_match_with_streaming_platforms():
-    """Test that matched movies include streaming platform data"""
-    matcher = MovieMatcher()
-    
-    matched = matcher.match_by_title("Inception")
-    
-    assert matched is not None
-    # Inception may or may not be on streaming platforms
-    if matched.streaming_platforms:
-        assert isinstance(matched.streaming_platforms, list)
-
-
-if __name__ == "__main__":
-    print("Running movie matcher tests...\n")
-    
-    test_matcher_initialization()
-    print("✓ Matcher initialization test passed")
-    
-    test_match_by_imdb_id()
-    print("✓ Match by IMDb ID test passed")
-    
-    test_match_by_title()
 if __name__ == "__main__":
     import sys
     verbose = "--verbose" in sys.argv or "-v" in sys.argv
     
     print("Running movie matcher tests...\n")
     
+    # Shared by the tests and the verbose output below
+    jw_client = JustWatchClient()
+    lb_client = LetterboxdClient()
+    matcher = MovieMatcher(jw_client, lb_client)
+    inception_jw = jw_client.search_movies("Inception", count=1)[0]
+    inception_matched = matcher.match_by_title("Inception")
+    
     test_matcher_initialization()
     print("✓ Matcher initialization test passed")
     
     if verbose:
         print("\nTest: match_by_imdb_id")
-        matcher = MovieMatcher()
-        jw_client = JustWatchClient()
-        results = jw_client.search_movies("Inception", count=1)
-        if results:
-            matched = matcher.match_by_imdb_id(results[0])
-            print(f"  Title: {matched.title}")
-            print(f"  IMDb ID: {matched.imdb_id}")
-            print(f"  Letterboxd rating: {matched.letterboxd_rating}")
-            print(f"  Streaming: {matched.streaming_platforms}")
-    
-    test_match_by_imdb_id()
+        matched = matcher.match_by_imdb_id(inception_jw)
+        print(f"  Title: {matched.title}")
+        print(f"  IMDb ID: {matched.imdb_id}")
+        print(f"  Letterboxd rating: {matched.letterboxd_rating}")
+        print(f"  Streaming: {matched.streaming_platforms}")
+    
+    test_match_by_imdb_id(matcher, inception_jw)
     print("✓ Match by IMDb ID test passed")
     
     if verbose:
         print("\nTest: match_by_title")
-        matcher = MovieMatcher()
-        matched = matcher.match_by_title("Inception")
+        matched = inception_matched
         print(f"  Title: {matched.title}")
         print(f"  Year: {matched.year}")
         print(f"  JustWatch rating: {matched.justwatch_rating}")
         print(f"  Letterboxd rating: {matched.letterboxd_rating}")
     
-    test_match_by_title()
+    for attr, check in INCEPTION_CHECKS:
+        test_match_by_title(inception_matched, attr, check)
     print("✓ Match by title test passed")
     
     if verbose:
         print("\nTest: match_platform_movies")
-        matcher = MovieMatcher()
         movies = matcher.match_platform_movies("Netflix", count=3)
         print(f"  Found {len(movies)} Netflix movies:")
         for movie in movies[:2]:
             print(f"  - {movie.title} ({movie.letterboxd_rating if movie.letterboxd_rating else 'no rating'})")
     
-    test_match_platform_movies()
+    test_match_platform_movies(matcher)
     print("✓ Match platform movies test passed")
     
+    test_slug_from_url()
+    print("✓ Slug from URL test passed")
+    
+    test_match_reuses_known_slug()
+    print("✓ Known slug reuse test passed")
+    
     test_matched_movie_dataclass()
     print("✓ MatchedMovie dataclass test passed")
     
-    test_partial_match()
-    print("✓ Partial match test passed")
+    test_matched_movie_from_row()
+    print("✓ MatchedMovie from_row test passed")
     
-    test_match_with_genres()
-    print("✓ Match with genres test passed")
-    
-    test_match_with_streaming_platforms()
-    print("✓ Match with streaming platforms test passed")
+    test_partial_match(jw_client, matcher)
+    print("✓ Partial match test passed")
     
     print("\n✓ All tests passed!")
     if not verbose:
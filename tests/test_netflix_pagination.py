@@ -1,63 +1,67 @@
 #!/usr/bin/env python3
 """Test Netflix scraper pagination with limited page count"""
 
+import pytest
 import asyncio
 import sys
 sys.path.insert(0, '.')
 
+from src.event_loop import run
 from src.scrapers.justwatch_netflix import NetflixScraper
 
 
+@pytest.mark.network
+@pytest.mark.slow
 async def test_pagination():
     """Test scraper pagination for first 10 pages"""
     scraper = NetflixScraper()
     
-    # Override max_pages for testing
     print("Testing Netflix scraper pagination (10 pages max)")
     print("=" * 60)
     
-    movies = []
-    page = 1
     max_pages = 10
     
-    import httpx
-    from bs4 import BeautifulSoup
-    import re
-    
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-        while page <= max_pages:
-            try:
-                url = f"{scraper.base_url}?page={page}"
-                print(f"\nScraping page {page}: {url}")
-                
-                response = await client.get(url, headers=scraper.headers)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'lxml')
-                movie_links = soup.find_all('a', href=re.compile(r'/movie/'))
-                
-                if not movie_links:
+    # Fetch pages in concurrent windows (as the scraper does) so a stop
+    # partway through skips the remaining windows; the scraper's rate
+    # limiter keeps the load polite without a fixed sleep per page.
+    # Pages are consumed in order, stopping at the first empty or failed
+    # one or one with nothing new; the same film can appear on more than
+    # one page, so keep the first.
+    movies = []
+    seen = set()
+    scraped = 0
+    done = False
+    async with scraper:
+        for start in range(1, max_pages + 1, scraper.page_concurrency):
+            pages = range(start, min(start + scraper.page_concurrency, max_pages + 1))
+            results = await asyncio.gather(
+                *(scraper._fetch_page(scraper._client, page) for page in pages)
+            )
+            
+            for page, page_movies in zip(pages, results):
+                if not page_movies:
                     print(f"No movies found on page {page}, stopping")
+                    done = True
+                    break
+                new_movies = []
+                for movie in page_movies:
+                    if movie['justwatch_id'] not in seen:
+                        seen.add(movie['justwatch_id'])
+                        new_movies.append(movie)
+                # Past the end JustWatch may keep re-rendering earlier tiles
+                if not new_movies:
+                    print(f"No new unique movies on page {page}, stopping")
+                    done = True
                     break
-                
-                page_movies = []
-                for link in movie_links:
-                    movie = scraper._extract_movie_data_from_link(link)
-                    if movie:
-                        page_movies.append(movie)
-                
-                movies.extend(page_movies)
-                print(f"Page {page}: Found {len(movie_links)} links, extracted {len(page_movies)} unique movies (total: {len(movies)})")
-                
-                page += 1
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                print(f"Error on page {page}: {e}")
+                movies.extend(new_movies)
+                scraped = page
+                print(f"Page {page}: extracted {len(page_movies)} movies, {len(new_movies)} new (total: {len(movies)})")
+            
+            if done:
                 break
     
     print("\n" + "=" * 60)
-    print(f"Test complete: {len(movies)} movies scraped from {page-1} pages")
+    print(f"Test complete: {len(movies)} movies scraped from {scraped} pages")
     print(f"\nSample movies:")
     for movie in movies[:5]:
         print(f"  - {movie['title']} ({movie.get('year', 'N/A')})")
@@ -66,5 +70,5 @@ async def test_pagination():
 
 
 if __name__ == "__main__":
-    movies = asyncio.run(test_pagination())
+    movies = run(test_pagination())
     print(f"\n✅ Pagination test successful: {len(movies)} movies")
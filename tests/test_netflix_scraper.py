@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""Test suite for Netflix catalog page parsing (offline)"""
+
+import asyncio
+import re
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+from src.scrapers.justwatch_netflix import NetflixScraper
+
+
+SAMPLE_PAGE = """
+<html><body>
+  <div class="title-list-grid__item">
+    <a href="/us/movie/inception"><span>Inception</span></a> 2010
+  </div>
+  <div class="title-list-grid__item">
+    <a href="/us/movie/the-matrix?ref=grid">The <b>Matrix</b></a> (1999)
+  </div>
+  <div class="title-list-grid__item">
+    <a href="/us/movie/no-title"></a>
+  </div>
+  <a href="/us/tv-show/stranger-things">Stranger Things</a>
+</body></html>
+"""
+
+EXPECTED = [
+    {
+        'title': "Inception",
+        'year': 2010,
+        'imdb_id': None,
+        'justwatch_id': "inception",
+        'justwatch_url': "https://www.justwatch.com/us/movie/inception"
+    },
+    {
+        'title': "TheMatrix",
+        'year': 1999,
+        'imdb_id': None,
+        'justwatch_id': "the-matrix",
+        'justwatch_url': "https://www.justwatch.com/us/movie/the-matrix?ref=grid"
+    },
+]
+
+
+def _extract(scraper, links):
+    """Run link extraction and drop links without data"""
+    movies = [scraper._extract_movie_data_from_link(link) for link in links]
+    return [movie for movie in movies if movie]
+
+
+def test_find_movie_links():
+    """Test movie links are parsed from a catalog page"""
+    scraper = NetflixScraper()
+    links = scraper._find_movie_links(SAMPLE_PAGE)
+    
+    assert len(links) == 3
+    assert _extract(scraper, links) == EXPECTED
+
+
+def test_find_movie_links_bytes():
+    """Test raw UTF-8 response bytes parse like decoded text"""
+    scraper = NetflixScraper()
+    page = SAMPLE_PAGE.replace("Inception", "Amélie")
+    links = scraper._find_movie_links(page.encode('utf-8'))
+    
+    assert _extract(scraper, links)[0]['title'] == "Amélie"
+
+
+def test_extract_from_beautifulsoup():
+    """Test extraction also accepts BeautifulSoup elements"""
+    scraper = NetflixScraper()
+    soup = BeautifulSoup(SAMPLE_PAGE, 'lxml')
+    links = soup.find_all('a', href=re.compile(r'/movie/'))
+    
+    assert _extract(scraper, links) == EXPECTED
+
+
+def test_sweep_movie_links():
+    """Test the regex sweep matches the parser on plain tile markup"""
+    scraper = NetflixScraper()
+    page = (
+        '<div class="title-list-grid__item"><a class="tile" href="/us/movie/inception">Inception</a> 2010</div>'
+        '<div class="title-list-grid__item"><a href="/us/movie/fast-and-furious">Fast &amp; Furious</a></div>'
+        '<a href="/us/tv-show/stranger-things">Stranger Things</a>'
+    )
+    
+    movies = scraper._sweep_movie_links(page.encode('utf-8'))
+    
+    assert movies == _extract(scraper, scraper._find_movie_links(page))
+    assert [m['title'] for m in movies] == ["Inception", "Fast & Furious"]
+    assert movies[0]['year'] == 2010
+    
+    # Nested markup is left to the parser
+    assert scraper._sweep_movie_links(SAMPLE_PAGE.encode('utf-8')) == []
+
+
+def test_parse_page_mixed_markup():
+    """Test pages mixing plain tiles with other links fall back to the parser"""
+    scraper = NetflixScraper()
+    page = (
+        '<div><a href="/us/movie/blade-runner-2049">Blade Runner 2049</a> 2017</div>'
+        '<div><a href="/us/movie/2001">2001: A Space Odyssey</a> 1968</div>'
+        '<div><a href="https://www.justwatch.com/us/movie/heat">Heat</a> 1995</div>'
+        '<div><a href="/us/movie/the-matrix"><span>The Matrix</span></a> 1999</div>'
+        '<div><a href="/us/movie/alien">Alien</a><span>1979</span></div>'
+    ).encode('utf-8')
+    
+    movies = scraper._parse_page(page)
+    
+    assert movies == _extract(scraper, scraper._find_movie_links(page))
+    assert [m['title'] for m in movies] == [
+        "Blade Runner 2049", "2001: A Space Odyssey", "Heat", "The Matrix", "Alien"
+    ]
+    
+    # The sweep keys titles with a year in them the way the parser does
+    plain = page[:page.index(b'<div><a href="https')]
+    assert scraper._sweep_movie_links(plain) == movies[:2]
+    assert [m['year'] for m in movies[:2]] == [2049, 2001]
+
+
+def test_shared_client(monkeypatch):
+    """Test detail fetches reuse one client inside the context manager"""
+    created = []
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        return httpx.Response(200, html='<a href="https://www.imdb.com/title/tt1375666/">IMDb</a>')
+    
+    def client_factory(**kwargs):
+        client = real_client(transport=httpx.MockTransport(handler), **kwargs)
+        created.append(client)
+        return client
+    
+    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+    
+    async def run():
+        async with NetflixScraper() as scraper:
+            return [await scraper.get_movie_details(jw_id) for jw_id in ("a", "b", "c")]
+    
+    details = asyncio.run(run())
+    
+    assert details == [{'imdb_id': "tt1375666"}] * 3
+    assert len(created) == 1
+    assert created[0].is_closed
+    
+    # Outside the context manager each call gets its own client
+    asyncio.run(NetflixScraper().get_movie_details("a"))
+    assert len(created) == 2
+
+
+def test_scrape_catalog_pages(monkeypatch):
+    """Test concurrent page windows keep page order and stop at the end"""
+    requested = []
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        page = int(request.url.params['page'])
+        requested.append(page)
+        if page > 7:
+            return httpx.Response(200, html="<html></html>")
+        return httpx.Response(200, html=f'<div><a href="/us/movie/m{page}">Movie {page}</a></div>')
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    scraper = NetflixScraper(page_concurrency=3, max_rate=0, cache_dir=None)
+    movies = asyncio.run(scraper.scrape_catalog())
+    
+    assert [m['title'] for m in movies] == [f"Movie {p}" for p in range(1, 8)]
+    # Three windows of three pages: 1-3, 4-6, 7-9
+    assert sorted(requested) == list(range(1, 10))
+
+
+def test_failed_page_retried(monkeypatch):
+    """Test a transient page failure is retried rather than ending the catalog"""
+    attempts = []
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        page = int(request.url.params['page'])
+        attempts.append(page)
+        if page == 2 and attempts.count(2) == 1:
+            return httpx.Response(429)
+        if page > 3:
+            return httpx.Response(200, html="<html></html>")
+        return httpx.Response(200, html=f'<div><a href="/us/movie/m{page}">Movie {page}</a></div>')
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    scraper = NetflixScraper(page_concurrency=2, max_rate=0, cache_dir=None, retry_backoff=0)
+    movies = asyncio.run(scraper.scrape_catalog())
+    
+    assert [m['title'] for m in movies] == ["Movie 1", "Movie 2", "Movie 3"]
+    assert attempts.count(2) == 2
+    assert scraper.last_scrape_complete
+
+
+def test_failed_page_marks_scrape_incomplete(monkeypatch):
+    """Test a page that keeps failing stops the scrape and flags it incomplete"""
+    attempts = []
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        page = int(request.url.params['page'])
+        attempts.append(page)
+        if page == 2:
+            return httpx.Response(503)
+        if page > 3:
+            return httpx.Response(200, html="<html></html>")
+        return httpx.Response(200, html=f'<div><a href="/us/movie/m{page}">Movie {page}</a></div>')
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    scraper = NetflixScraper(
+        page_concurrency=2, max_rate=0, cache_dir=None, max_retries=2, retry_backoff=0
+    )
+    movies = asyncio.run(scraper.scrape_catalog())
+    
+    assert [m['title'] for m in movies] == ["Movie 1"]
+    assert attempts.count(2) == 3
+    assert not scraper.last_scrape_complete
+
+
+def test_catalog_cache(monkeypatch, tmp_path):
+    """Test a saved catalog is reused until it expires"""
+    requested = []
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        page = int(request.url.params['page'])
+        requested.append(page)
+        if page > 1:
+            return httpx.Response(200, html="<html></html>")
+        return httpx.Response(200, html='<div><a href="/us/movie/inception">Inception</a> 2010</div>')
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    scraper = NetflixScraper(page_concurrency=2, max_rate=0, cache_dir=str(tmp_path))
+    first = asyncio.run(scraper.scrape_catalog())
+    assert (tmp_path / "netflix_us.json").exists()
+    
+    # Served from disk without any requests
+    requested.clear()
+    assert asyncio.run(scraper.scrape_catalog()) == first
+    assert requested == []
+    
+    # Bypassed on request, and ignored once expired
+    asyncio.run(scraper.scrape_catalog(use_cache=False))
+    assert requested
+    
+    requested.clear()
+    scraper.cache_ttl_hours = 0
+    assert asyncio.run(scraper.scrape_catalog()) == first
+    assert requested
+
+
+def test_incomplete_catalog_not_saved(monkeypatch, tmp_path):
+    """Test a scrape cut short by a failed page isn't saved for reuse"""
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        page = int(request.url.params['page'])
+        if page == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, html=f'<div><a href="/us/movie/m{page}">Movie {page}</a></div>')
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    scraper = NetflixScraper(
+        page_concurrency=2, max_rate=0, cache_dir=str(tmp_path), max_retries=0
+    )
+    assert [m['title'] for m in asyncio.run(scraper.scrape_catalog())] == ["Movie 1"]
+    assert not (tmp_path / "netflix_us.json").exists()
+
+
+def test_conditional_page_requests(monkeypatch, tmp_path):
+    """Test unchanged pages are revalidated with ETags and reused on 304"""
+    seen = []
+    real_client = httpx.AsyncClient
+    
+    def handler(request):
+        page = int(request.url.params['page'])
+        etag = f'"page-{page}"'
+        seen.append((page, request.headers.get('if-none-match')))
+        if request.headers.get('if-none-match') == etag:
+            return httpx.Response(304, headers={'ETag': etag})
+        if page > 2:
+            return httpx.Response(200, html="<html></html>")
+        return httpx.Response(
+            200, headers={'ETag': etag},
+            html=f'<div><a href="/us/movie/m{page}">Movie {page}</a></div>'
+        )
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    scraper = NetflixScraper(page_concurrency=3, max_rate=0, cache_dir=str(tmp_path))
+    first = asyncio.run(scraper.scrape_catalog())
+    assert [m['title'] for m in first] == ["Movie 1", "Movie 2"]
+    assert all(etag is None for _, etag in seen)
+    
+    # A new scraper (fresh process) revalidates from the saved validators
+    seen.clear()
+    scraper = NetflixScraper(page_concurrency=3, max_rate=0, cache_dir=str(tmp_path))
+    assert asyncio.run(scraper.scrape_catalog(use_cache=False)) == first
+    assert sorted(seen) == [(1, '"page-1"'), (2, '"page-2"'), (3, None)]
+
+
+def test_brotli_response(monkeypatch):
+    """Test brotli is requested and brotli-encoded pages decode"""
+    brotli = pytest.importorskip("brotli")
+    seen = []
+    real_client = httpx.AsyncClient
+    body = brotli.compress(b'<a href="https://www.imdb.com/title/tt1375666/">IMDb</a>')
+    
+    def handler(request):
+        seen.append(request.headers['accept-encoding'])
+        return httpx.Response(200, content=body, headers={'Content-Encoding': 'br'})
+    
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    
+    details = asyncio.run(NetflixScraper().get_movie_details("inception"))
+    
+    assert "br" in seen[0]
+    assert details == {'imdb_id': "tt1375666"}
+
+
+if __name__ == "__main__":
+    import sys
+    verbose = "--verbose" in sys.argv or "-v" in sys.argv
+    
+    print("Running Netflix scraper parsing tests...\n")
+    
+    if verbose:
+        print("\nTest: find_movie_links")
+        scraper = NetflixScraper()
+        for movie in _extract(scraper, scraper._find_movie_links(SAMPLE_PAGE)):
+            print(f"  - {movie['title']} ({movie['year']}) - {movie['justwatch_id']}")
+    
+    test_find_movie_links()
+    print("✓ Find movie links test passed")
+    
+    test_find_movie_links_bytes()
+    print("✓ Find movie links from bytes test passed")
+    
+    test_extract_from_beautifulsoup()
+    print("✓ BeautifulSoup extraction test passed")
+    
+    test_sweep_movie_links()
+    print("✓ Regex sweep test passed")
+    
+    test_parse_page_mixed_markup()
+    print("✓ Mixed markup test passed")
+    
+    print("\n✓ All tests passed!")
+    if not verbose:
+        print("\nRun with --verbose or -v to see detailed output")
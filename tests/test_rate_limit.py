@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test suite for async rate limiter"""
+
+import asyncio
+import pytest
+import time
+from types import SimpleNamespace
+from src import rate_limit
+from src.rate_limit import RateLimiter
+
+
+def test_acquire_spacing():
+    """Test concurrent acquisitions are spaced by the interval"""
+    limiter = RateLimiter(interval=0.05)
+    stamps = []
+    
+    async def worker():
+        await limiter.acquire()
+        stamps.append(time.monotonic())
+    
+    async def run():
+        await asyncio.gather(*(worker() for _ in range(4)))
+    
+    asyncio.run(run())
+    
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert len(stamps) == 4
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+def test_late_wakeup_keeps_spacing(monkeypatch):
+    """Test a late wake-up pushes the next slot back instead of shortening the gap"""
+    limiter = RateLimiter(interval=1.0)
+    clock = [100.0]
+    # Only the first sleep oversleeps
+    oversleep = [0.5]
+    
+    async def sleep(delay):
+        clock[0] += delay + (oversleep.pop() if oversleep else 0)
+    
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    monkeypatch.setattr(rate_limit, "asyncio", SimpleNamespace(sleep=sleep))
+    stamps = []
+    
+    async def run():
+        for _ in range(3):
+            await limiter.acquire()
+            stamps.append(clock[0])
+    
+    asyncio.run(run())
+    
+    assert stamps == [100.0, 101.5, 102.5]
+
+
+def test_zero_interval():
+    """Test zero interval never waits"""
+    limiter = RateLimiter(interval=0)
+    
+    async def run():
+        for _ in range(100):
+            await limiter.acquire()
+    
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start < 0.5
+
+
+def test_burst():
+    """Test a burst passes immediately, then acquisitions are spaced"""
+    limiter = RateLimiter.per_second(20, burst=3)
+    stamps = []
+    
+    async def run():
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+            stamps.append(time.monotonic() - start)
+    
+    asyncio.run(run())
+    
+    # First three fire back to back, the rest wait for a refill
+    assert stamps[2] < 0.02
+    assert stamps[3] >= 0.045
+    assert stamps[4] - stamps[3] >= 0.045
+
+
+if __name__ == "__main__":
+    import sys
+    verbose = "--verbose" in sys.argv or "-v" in sys.argv
+    
+    print("Running rate limiter tests...\n")
+    
+    if verbose:
+        print("\nTest: acquire_spacing")
+        limiter = RateLimiter(interval=0.05)
+        
+        async def show():
+            start = time.monotonic()
+            for i in range(3):
+                await limiter.acquire()
+                print(f"  Acquire {i + 1} at +{time.monotonic() - start:.3f}s")
+        
+        asyncio.run(show())
+    
+    test_acquire_spacing()
+    print("✓ Acquire spacing test passed")
+    
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_late_wakeup_keeps_spacing(monkeypatch)
+    print("✓ Late wake-up test passed")
+    
+    test_zero_interval()
+    print("✓ Zero interval test passed")
+    
+    test_burst()
+    print("✓ Burst test passed")
+    
+    print("\n✓ All tests passed!")
+    if not verbose:
+        print("\nRun with --verbose or -v to see detailed output")
@@ -1,13 +1,38 @@
 #!/usr/bin/env python3
 """Test suite for FastAPI web application"""
 
+import asyncio
+import httpx
 import pytest
+import time
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
+from src.cache import MovieCache
+from src.matcher import MatchedMovie
+from src.web import app as app_module
 from src.web.app import app
 
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module")
+def inception_search():
+    """Live search for Inception, made once per module (also caches the movie)"""
+    return client.get("/api/search?query=Inception&count=5")
+
+
+@pytest.fixture(scope="module")
+def netflix_movies():
+    """Live unfiltered Netflix listing, made once per module"""
+    return client.get("/api/movies/Netflix?count=10")
+
+
+@pytest.fixture(scope="module")
+def openapi_response():
+    """OpenAPI schema response, fetched once per module"""
+    return client.get("/openapi.json")
+
+
 def test_root_endpoint():
     """Test root endpoint"""
     response = client.get("/")
@@ -35,9 +60,10 @@ def test_get_platforms():
     assert "Netflix" in platforms
 
 
-def test_search_movies():
+@pytest.mark.network
+def test_search_movies(inception_search):
     """Test search endpoint"""
-    response = client.get("/api/search?query=Inception&count=5")
+    response = inception_search
     assert response.status_code == 200
     data = response.json()
     assert "movies" in data
@@ -45,15 +71,87 @@ def test_search_movies():
     assert isinstance(data["movies"], list)
 
 
+def test_search_movies_concurrent(monkeypatch):
+    """Test search matches results concurrently and caches them"""
+    jw_results = [SimpleNamespace(title=f"Movie {i}", imdb_id=f"tt{i}") for i in range(6)]
+    cached = []
+    
+    def slow_match(jw_movie):
+        time.sleep(0.2)
+        return MatchedMovie(title=jw_movie.title, imdb_id=jw_movie.imdb_id)
+    
+    monkeypatch.setattr(app_module.jw_client, "search_movies", lambda query, count: jw_results)
+    monkeypatch.setattr(app_module.matcher, "match_by_imdb_id", slow_match)
+    monkeypatch.setattr(app_module.cache, "get_many", lambda imdb_ids: {})
+    monkeypatch.setattr(app_module.cache, "set_many", cached.extend)
+    
+    start = time.monotonic()
+    response = client.get("/api/search?query=Movie&count=6")
+    elapsed = time.monotonic() - start
+    
+    assert response.status_code == 200
+    assert [m["title"] for m in response.json()["movies"]] == [m.title for m in jw_results]
+    assert [m.title for m in cached] == [m.title for m in jw_results]
+    # Serial matching would take 6 x 0.2s
+    assert elapsed < 0.8
+
+
+def test_search_movies_uses_cache(monkeypatch):
+    """Test search only matches results missing from the cache"""
+    jw_results = [SimpleNamespace(title=f"Movie {i}", imdb_id=f"tt{i}") for i in range(4)]
+    jw_results.append(SimpleNamespace(title="No IMDb", imdb_id=None))
+    hits = {"tt1": MatchedMovie(title="Movie 1 (cached)", imdb_id="tt1")}
+    matched = []
+    
+    def match(jw_movie):
+        matched.append(jw_movie.title)
+        return MatchedMovie(title=jw_movie.title, imdb_id=jw_movie.imdb_id)
+    
+    monkeypatch.setattr(app_module.jw_client, "search_movies", lambda query, count: jw_results)
+    monkeypatch.setattr(app_module.matcher, "match_by_imdb_id", match)
+    monkeypatch.setattr(app_module.cache, "get_many", lambda imdb_ids: dict(hits))
+    monkeypatch.setattr(app_module.cache, "set_many", lambda movies: None)
+    
+    response = client.get("/api/search?query=Movie&count=5")
+    
+    assert response.status_code == 200
+    titles = [m["title"] for m in response.json()["movies"]]
+    assert titles == ["Movie 0", "Movie 1 (cached)", "Movie 2", "Movie 3"]
+    assert sorted(matched) == ["Movie 0", "Movie 2", "Movie 3"]
+
+
+def test_lifespan_releases_resources(monkeypatch):
+    """Test the scheduler runs for the app lifetime and connections close on shutdown"""
+    events = []
+    
+    class Recorder:
+        def __init__(self, name):
+            self.name = name
+        
+        def __getattr__(self, method):
+            return lambda: events.append(f"{self.name}.{method}")
+    
+    monkeypatch.setattr(app_module, "scheduler", Recorder("scheduler"))
+    monkeypatch.setattr(app_module, "lb_client", Recorder("lb_client"))
+    monkeypatch.setattr(app_module, "cache", Recorder("cache"))
+    
+    with TestClient(app) as lifespan_client:
+        assert events == ["scheduler.start"]
+        assert lifespan_client.get("/health").status_code == 200
+    
+    assert events == ["scheduler.start", "scheduler.stop", "lb_client.close", "cache.close"]
+
+
 def test_search_movies_invalid_count():
     """Test search with invalid count parameter"""
     response = client.get("/api/search?query=Inception&count=100")
     assert response.status_code == 422  # Validation error
 
 
-def test_get_movies_by_platform():
+@pytest.mark.network
+def test_get_movies_by_platform(netflix_movies):
     """Test get movies by platform endpoint"""
-    response = client.get("/api/movies/Netflix?count=5")
+    response = netflix_movies
     assert response.status_code == 200
     data = response.json()
     assert "movies" in data
@@ -66,33 +164,117 @@ def test_get_movies_by_platform():
             assert any("Netflix" in platform for platform in movie["streaming_platforms"])
 
 
-def test_get_movies_with_genre_filter():
-    """Test platform movies with genre filter"""
-    response = client.get("/api/movies/Netflix?count=10&genre=Action")
+def test_platform_movies_sorted_by_rating(monkeypatch):
+    """Test platform movies are sorted by rating with unrated ones last"""
+    movies = [
+        MatchedMovie(title="Unrated A"),
+        MatchedMovie(title="Good", letterboxd_rating=3.5),
+        MatchedMovie(title="Best", letterboxd_rating=4.5),
+        MatchedMovie(title="Unrated B"),
+        MatchedMovie(title="Also Good", letterboxd_rating=3.5),
+        MatchedMovie(title="Zero", letterboxd_rating=0.0),
+    ]
+    
+    async def fake_match(platform, count):
+        return movies
+    
+    monkeypatch.setattr(app_module.matcher, "match_platform_movies_async", fake_match)
+    monkeypatch.setattr(app_module.cache, "has_platform_catalog", lambda platform: False)
+    
+    response = client.get("/api/movies/Netflix?count=6")
+    assert response.status_code == 200
+    titles = [m["title"] for m in response.json()["movies"]]
+    assert titles == ["Best", "Good", "Also Good", "Zero", "Unrated A", "Unrated B"]
+
+
+def test_platform_movies_filters(monkeypatch):
+    """Test year, rating and genre filters combine on platform movies"""
+    movies = [
+        MatchedMovie(title="Match", year=2010, letterboxd_rating=4.0, genres=["Drama"]),
+        MatchedMovie(title="Wrong Year", year=2011, letterboxd_rating=4.0, genres=["Drama"]),
+        MatchedMovie(title="Too Low", year=2010, letterboxd_rating=2.5, genres=["Drama"]),
+        MatchedMovie(title="Unrated", year=2010, genres=["Drama"]),
+        MatchedMovie(title="Wrong Genre", year=2010, letterboxd_rating=4.0, genres=["Comedy"]),
+        MatchedMovie(title="No Genres", year=2010, letterboxd_rating=4.0),
+    ]
+    
+    async def fake_match(platform, count):
+        return movies
+    
+    monkeypatch.setattr(app_module.matcher, "match_platform_movies_async", fake_match)
+    monkeypatch.setattr(app_module.cache, "has_platform_catalog", lambda platform: False)
+    
+    response = client.get("/api/movies/Netflix?year=2010&min_rating=3&max_rating=4.5&genre=Drama")
     assert response.status_code == 200
     data = response.json()
+    assert [m["title"] for m in data["movies"]] == ["Match"]
+    assert data["movies"][0]["genres"] == ["Drama"]
     
-    # Verify genre filter applied
-    for movie in data["movies"]:
-        if movie["genres"]:
-            assert "Action" in movie["genres"]
+    # Without filters everything is returned
+    response = client.get("/api/movies/Netflix?count=6")
+    assert response.json()["total"] == len(movies)
+
+
+def test_platform_movies_from_cached_catalog(monkeypatch):
+    """Test synced platforms are served by the cache query, not live matching"""
+    queries = []
+    
+    def query_platform(platform, **filters):
+        queries.append((platform, filters))
+        return [MatchedMovie(title="Cached", year=2010, letterboxd_rating=4.0)]
+    
+    async def fake_match(platform, count):
+        raise AssertionError("cached platforms must not be matched live")
+    
+    monkeypatch.setattr(app_module.matcher, "match_platform_movies_async", fake_match)
+    monkeypatch.setattr(app_module.cache, "has_platform_catalog", lambda platform: True)
+    monkeypatch.setattr(app_module.cache, "query_platform", query_platform)
+    
+    response = client.get("/api/movies/Netflix?count=5&year=2010&min_rating=3&genre=Drama")
+    assert response.status_code == 200
+    assert [m["title"] for m in response.json()["movies"]] == ["Cached"]
+    assert queries == [("Netflix", {
+        'year': 2010, 'min_rating': 3.0, 'max_rating': None, 'genre': "Drama", 'limit': 5
+    })]
 
 
-def test_get_movies_with_rating_filter():
-    """Test platform movies with rating filter"""
-    response = client.get("/api/movies/Netflix?count=10&min_rating=4.0")
+def test_search_cached_platform_matched_live(monkeypatch, tmp_path):
+    """Test movies cached by a search don't stand in for a platform's catalog"""
+    cache = MovieCache(str(tmp_path / "movies.db"))
+    cache.set_many([MatchedMovie(title="Searched", streaming_platforms=["Hulu"])])
+    
+    async def fake_match(platform, count):
+        return [MatchedMovie(title="Live", streaming_platforms=["Hulu"])]
+    
+    monkeypatch.setattr(app_module, "cache", cache)
+    monkeypatch.setattr(app_module.matcher, "match_platform_movies_async", fake_match)
+    
+    response = client.get("/api/movies/Hulu")
+    cache.close()
+    assert response.status_code == 200
+    assert [m["title"] for m in response.json()["movies"]] == ["Live"]
+
+
+@pytest.mark.network
+def test_get_movies_with_filters():
+    """Test platform movies with genre and rating filters in one request"""
+    response = client.get("/api/movies/Netflix?count=10&genre=Action&min_rating=4.0")
     assert response.status_code == 200
     data = response.json()
     
-    # Verify rating filter applied
+    # Verify both filters applied
     for movie in data["movies"]:
+        if movie["genres"]:
+            assert "Action" in movie["genres"]
         if movie["letterboxd_rating"]:
             assert movie["letterboxd_rating"] >= 4.0
-def test_get_movie_by_imdb_id():
+
+
+@pytest.mark.network
+def test_get_movie_by_imdb_id(inception_search):
     """Test get movie by IMDb ID - should require movie to be cached first"""
-    # First, search for Inception to cache it
-    search_response = client.get("/api/search?query=Inception&count=1")
-    assert search_response.status_code == 200
+    # The Inception search caches it
+    assert inception_search.status_code == 200
     
     # Now try to get by IMDb ID (should be cached)
     response = client.get("/api/movie/tt1375666")
@@ -102,8 +284,48 @@ def test_get_movie_by_imdb_id():
     assert "title" in movie
 
 
-def test_get_movie_not_found():
-    """Test get movie with invalid IMDb ID"""
+def test_get_movie_memoized(monkeypatch):
+    """Test repeat movie lookups skip the cache until a search re-matches the movie"""
+    lookups = []
+    
+    def get(imdb_id):
+        lookups.append(imdb_id)
+        return MatchedMovie(title=f"Movie {len(lookups)}", imdb_id=imdb_id)
+    
+    monkeypatch.setattr(app_module, "_movie_memo", type(app_module._movie_memo)())
+    monkeypatch.setattr(app_module.cache, "get", get)
+    
+    assert client.get("/api/movie/tt1").json()["title"] == "Movie 1"
+    assert client.get("/api/movie/tt1").json()["title"] == "Movie 1"
+    assert lookups == ["tt1"]
+    
+    # Expired entries are looked up again
+    monkeypatch.setattr(app_module, "MOVIE_MEMO_TTL_SECONDS", -1)
+    client.get("/api/movie/tt2")
+    client.get("/api/movie/tt2")
+    assert lookups == ["tt1", "tt2", "tt2"]
+    
+    # A search that caches a new match drops its memoized response
+    monkeypatch.setattr(app_module, "MOVIE_MEMO_TTL_SECONDS", 300)
+    jw_results = [SimpleNamespace(title="Movie", imdb_id="tt1")]
+    monkeypatch.setattr(app_module.jw_client, "search_movies", lambda query, count: jw_results)
+    monkeypatch.setattr(app_module.matcher, "match_by_imdb_id", lambda jw: MatchedMovie(title="New", imdb_id=jw.imdb_id))
+    monkeypatch.setattr(app_module.cache, "get_many", lambda imdb_ids: {})
+    monkeypatch.setattr(app_module.cache, "set_many", lambda movies: None)
+    client.get("/api/search?query=Movie")
+    client.get("/api/movie/tt1")
+    assert lookups == ["tt1", "tt2", "tt2", "tt1"]
+
+
+def test_get_movie_not_found(monkeypatch):
+    """Test get movie with invalid IMDb ID 404s without an upstream lookup"""
+    def upstream(*args, **kwargs):
+        raise AssertionError("unexpected upstream lookup")
+    
+    monkeypatch.setattr(app_module.cache, "get", lambda imdb_id: None)
+    monkeypatch.setattr(app_module.jw_client, "search_movies", upstream)
+    monkeypatch.setattr(app_module.matcher, "match_by_imdb_id", upstream)
+    
     response = client.get("/api/movie/tt0000000")
     assert response.status_code == 404
 
@@ -118,13 +340,14 @@ def test_cache_stats():
 
 def test_api_documentation():
     """Test that OpenAPI docs are available"""
-    response = client.get("/docs")
+    # HEAD is enough to check the route without transferring the page
+    response = client.head("/docs")
     assert response.status_code == 200
 
 
-def test_openapi_schema():
+def test_openapi_schema(openapi_response):
     """Test OpenAPI schema endpoint"""
-    response = client.get("/openapi.json")
+    response = openapi_response
     assert response.status_code == 200
     schema = response.json()
     assert "openapi" in schema
@@ -132,6 +355,23 @@ def test_openapi_schema():
     assert "paths" in schema
 
 
+def test_static_endpoints_concurrent():
+    """Test the data-independent endpoints answer concurrently on one ASGI client"""
+    paths = ["/", "/health", "/api/platforms", "/api/cache/stats", "/docs", "/openapi.json"]
+    
+    async def fetch_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*(async_client.get(path) for path in paths))
+    
+    responses = dict(zip(paths, asyncio.run(fetch_all())))
+    
+    assert all(response.status_code == 200 for response in responses.values())
+    assert responses["/health"].json()["status"] == "healthy"
+    assert "Netflix" in responses["/api/platforms"].json()
+    assert "total_entries" in responses["/api/cache/stats"].json()
+    assert "paths" in responses["/openapi.json"].json()
+
 if __name__ == "__main__":
     import sys
     verbose = "--verbose" in sys.argv or "-v" in sys.argv
@@ -155,36 +395,33 @@ if __name__ == "__main__":
     test_get_platforms()
     print("✓ Get platforms test passed")
     
+    search_response = client.get("/api/search?query=Inception&count=5")
     if verbose:
         print("\nTest: search_movies")
-        response = client.get("/api/search?query=Inception&count=3")
-        data = response.json()
+        data = search_response.json()
         print(f"  Found {data['total']} movies")
         for movie in data["movies"][:2]:
             print(f"  - {movie['title']} ({movie['year']}): {movie['letterboxd_rating']}/5.0")
     
-    test_search_movies()
+    test_search_movies(search_response)
     print("✓ Search movies test passed")
     
     test_search_movies_invalid_count()
     print("✓ Search validation test passed")
     
+    platform_response = client.get("/api/movies/Netflix?count=10")
     if verbose:
         print("\nTest: get_movies_by_platform")
-        response = client.get("/api/movies/Netflix?count=3")
-        data = response.json()
+        data = platform_response.json()
         print(f"  Found {data['total']} Netflix movies")
         for movie in data["movies"][:2]:
             print(f"  - {movie['title']}: {movie['letterboxd_rating'] or 'no rating'}")
     
-    test_get_movies_by_platform()
+    test_get_movies_by_platform(platform_response)
     print("✓ Get movies by platform test passed")
     
-    test_get_movies_with_genre_filter()
-    print("✓ Genre filter test passed")
-    
-    test_get_movies_with_rating_filter()
-    print("✓ Rating filter test passed")
+    test_get_movies_with_filters()
+    print("✓ Genre and rating filter test passed")
     
     if verbose:
         print("\nTest: get_movie_by_imdb_id")
@@ -194,10 +431,11 @@ if __name__ == "__main__":
         print(f"  IMDb ID: {movie['imdb_id']}")
         print(f"  Letterboxd rating: {movie['letterboxd_rating']}")
     
-    test_get_movie_by_imdb_id()
+    test_get_movie_by_imdb_id(search_response)
     print("✓ Get movie by IMDb ID test passed")
     
-    test_get_movie_not_found()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_get_movie_not_found(monkeypatch)
     print("✓ Movie not found test passed")
     
     test_cache_stats()
@@ -206,9 +444,12 @@ if __name__ == "__main__":
     test_api_documentation()
     print("✓ API documentation test passed")
     
-    test_openapi_schema()
+    test_openapi_schema(client.get("/openapi.json"))
     print("✓ OpenAPI schema test passed")
     
+    test_static_endpoints_concurrent()
+    print("✓ Concurrent static endpoints test passed")
+    
     print("\n✓ All web API tests passed!")
     if not verbose:
         print("\nRun with --verbose or -v to see detailed output")